@@ -1,30 +1,73 @@
 """Core of the simulation Package."""
 
 from .container import HasContainer, HasMultiContainer
-from .events_container import EventsContainer
-from .identifiable import Identifiable
+from .events_container import ContainerClaim, DirectLevelContainer, EventsContainer
+from .geodesy import (
+    WGS84,
+    DistanceCache,
+    DistanceMatrix,
+    cache_edge_geometries,
+    distance_cache,
+)
+from .identifiable import Identifiable, IdTable, get_id_table
 from .locatable import Locatable
-from .log import Log, LogState
+from .log import Log, LogLevel, LogState
+from .logbook import (
+    ArrowLogSink,
+    ColumnarLogbook,
+    EventTable,
+    FileLogbook,
+    LogFile,
+    LogSink,
+    ParquetLogSink,
+    SinkLogbook,
+    TableLogbook,
+)
 from .movable import ContainerDependentMovable, Movable, MultiContainerDependentMovable
 from .processor import LoadingFunction, Processor, UnloadingFunction
 from .resource import HasResource
+from .routing import RoutingService
 from .simpy_object import SimpyObject
+from .spatial_index import SpatialIndex
+from .state import get_state_fields
 
 __all__ = [
+    "ArrowLogSink",
     "basic",
+    "ColumnarLogbook",
+    "cache_edge_geometries",
     "HasContainer",
     "HasMultiContainer",
     "EventsContainer",
+    "EventTable",
+    "FileLogbook",
     "Identifiable",
+    "IdTable",
+    "get_id_table",
     "Locatable",
     "Log",
+    "LogLevel",
+    "LogFile",
     "LogState",
+    "LogSink",
     "Movable",
+    "ContainerClaim",
     "ContainerDependentMovable",
+    "DistanceCache",
+    "DistanceMatrix",
+    "distance_cache",
+    "DirectLevelContainer",
     "MultiContainerDependentMovable",
+    "ParquetLogSink",
     "Processor",
     "LoadingFunction",
     "UnloadingFunction",
+    "WGS84",
     "HasResource",
+    "RoutingService",
     "SimpyObject",
+    "SinkLogbook",
+    "SpatialIndex",
+    "get_state_fields",
+    "TableLogbook",
 ]
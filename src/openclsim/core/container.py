@@ -2,6 +2,7 @@
 
 from .events_container import EventsContainer
 from .simpy_object import SimpyObject
+from .state import get_state
 
 
 class HasContainer(SimpyObject):
@@ -17,6 +18,9 @@ class HasContainer(SimpyObject):
     store_capacity
         The number of different types of information can be stored. In this
         class it usually is 1 (default).
+    container_class
+        The class of the container, by default EventsContainer. Use
+        DirectLevelContainer for containers that no process waits on.
     """
 
     def __init__(
@@ -24,12 +28,12 @@ class HasContainer(SimpyObject):
         capacity: float,
         store_capacity: int = 1,
         level: float = 0.0,
+        container_class=EventsContainer,
         *args,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         """Initialization"""
-        container_class = EventsContainer
         self.container = container_class(self.env, store_capacity=store_capacity)
         if capacity > 0:
             initials = [
@@ -41,13 +45,8 @@ class HasContainer(SimpyObject):
             ]
             self.container.initialize_container(initials)
 
-    def get_state(self):
-        state = {}
-        if hasattr(super(), "get_state"):
-            state = super().get_state()
-
-        state.update({"container level": self.container.get_level()})
-        return state
+    state_fields = (("container level", lambda self: self.container.get_level()),)
+    get_state = get_state
 
 
 class HasMultiContainer(HasContainer):
@@ -66,18 +65,14 @@ class HasMultiContainer(HasContainer):
         super().__init__(capacity=0, store_capacity=store_capacity, *args, **kwargs)
         self.container.initialize_container(initials)
 
-    def get_state(self):
-        state = {}
-        if hasattr(super(), "get_state"):
-            state = super().get_state()
-
-        state.update(
-            {
-                "container level": {
-                    container: self.container.get_level(id_=container)
-                    for container in self.container.container_list
-                }
-            }
-        )
-
-        return state
+    state_fields = (
+        (
+            "container level",
+            lambda self: dict(
+                zip(
+                    self.container.container_list,
+                    self.container.get_levels().tolist(),
+                )
+            ),
+        ),
+    )
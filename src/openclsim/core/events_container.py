@@ -1,27 +1,110 @@
 """EventsContainer provides events based on the level of the container."""
 
+import array
+import bisect
+import heapq
+import itertools
 import operator as py_opp
+import sys
 
+import numpy as np
 import simpy
 
 
-class EventsContainer(simpy.FilterStore):
+class ContainerClaim(simpy.Event):
+    """
+    Event of a claim on the content or space of a container.
+
+    The event succeeds with the granted amount when the claim is granted, see
+    EventsContainer.claim_content and EventsContainer.claim_space.
+    """
+
+    def __init__(self, env, amount, id_, kind, priority=0, partial=False):
+        super().__init__(env)
+        self.amount = amount
+        self.id_ = id_
+        self.kind = kind
+        self.priority = priority
+        self.partial = partial
+        self.released = False
+
+
+class EventsContainer:
     """
     EventsContainer provides events based on the level of the contaier.
 
     It is a generic container, which has a default behavior, but can be used for
     storing arbitrary objects.
 
+    The levels and capacities are kept in numpy arrays with a dict that maps
+    each container id to its row, so queries do not scan the containers and
+    the levels of all containers can be used in vectorized expressions (see
+    get_levels, get_fill_degree, can_get_many and can_put_many). A put or get
+    changes the level at once and returns an event that has already
+    succeeded, so processes can still yield it.
+
+    Pending level events are kept in sorted lists of thresholds per container
+    id, so a level change only visits the events whose threshold it crossed.
+    Pending events are kept until they fire. When the number of pending
+    events has doubled, the events that no process waits for (no callbacks)
+    and that are not referenced elsewhere are dropped. Triggered events are
+    reused while their condition holds, up to max_triggered_events; the
+    oldest are evicted beyond that. So the registries do not grow with the
+    number of distinct thresholds that were ever requested. evicted_events
+    counts the evicted events.
+
     Parameters
     ----------
     store_capacity
         Number of stores that can be contained by the multicontainer
+    max_triggered_events
+        Maximum number of triggered events that are kept for reuse.
+    record_levels
+        Record the level of each container after every change, see
+        get_level_series. By default True.
     """
 
-    def __init__(self, env, store_capacity: int = 1, *args, **kwargs):
-        super().__init__(env, capacity=store_capacity * 2)
+    def __init__(
+        self,
+        env,
+        store_capacity: int = 1,
+        max_triggered_events: int = 1_000,
+        record_levels: bool = True,
+        *args,
+        **kwargs,
+    ):
         self._env = env
+        # (time, level) change points per container id, see get_level_series
+        self.record_levels = record_levels
+        self._level_series = {}
+        self.store_capacity = store_capacity
+        # the levels and capacities of all containers and their reservations,
+        # with the row of each id in _index
+        self._container_ids = []
+        self._container_ids_set = set()
+        self._container_rows = np.empty(0, dtype=int)
+        self._index = {}
+        self._levels = np.empty(0)
+        self._capacities = np.empty(0)
+        # the pending events by (id_, level, operator)
         self._container_events: dict = {}
+        # number of pending events at which the unused ones are dropped
+        self._prune_size = 64
+        # triggered events, reused while their condition holds
+        self._triggered_events: dict = {}
+        self.max_triggered_events = max_triggered_events
+        # number of events that were dropped from the registries
+        self.evicted_events = 0
+
+        # pending events per container id, sorted by threshold: rising for
+        # ge/gt and falling for le/lt events
+        self._thresholds = {}
+        self._threshold_entries = {}
+        self._counter = itertools.count()
+
+        # wait queues of the claims per (id_, kind), and the granted amounts
+        self._claim_queues = {}
+        self._claimed = {}
 
     def initialize_container(self, initials):
         """Initialize method used for MultiContainers."""
@@ -32,43 +115,72 @@ class EventsContainer(simpy.FilterStore):
             assert "level" in item
             assert not item["id"].endswith("_reservations")
 
-            container_item = {
-                "id": item["id"],
-                "capacity": item["capacity"],
-                "level": item["level"],
-            }
-            reservation_item = {
-                "id": f"{item['id']}_reservations",
-                "capacity": item["capacity"],
-                "level": item["level"],
-            }
-
-            super().put(container_item)
-            super().put(reservation_item)
+            id_ = item["id"]
+            if id_ not in self._index:
+                self._container_ids.append(id_)
+                self._container_ids_set.add(id_)
+                self._container_rows = np.append(self._container_rows, len(self._index))
+                for key in [id_, f"{id_}_reservations"]:
+                    self._index[key] = len(self._index)
+                self._levels = np.append(self._levels, [0.0, 0.0])
+                self._capacities = np.append(self._capacities, [0.0, 0.0])
+            for key in [id_, f"{id_}_reservations"]:
+                self._capacities[self._index[key]] = item["capacity"]
+                self._levels[self._index[key]] = item["level"]
+                self._fire_thresholds(key)
+            self._record_level(id_)
+            self._serve_claims(id_)
 
     @property
-    def container_list(self):
+    def items(self):
+        """The state of all containers (and their reservations) as dicts."""
+        levels = self._levels.tolist()
+        capacities = self._capacities.tolist()
         return [
-            item["id"]
-            for item in self.items
-            if not item["id"].endswith("_reservations")
+            {"id": key, "capacity": capacities[row], "level": levels[row]}
+            for key, row in self._index.items()
         ]
 
+    @property
+    def container_list(self):
+        return list(self._container_ids)
+
     def get_capacity(self, id_="default"):
-        if self.items is None:
-            return 0
-        res = [item["capacity"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        row = self._index.get(id_)
+        return 0 if row is None else float(self._capacities[row])
 
     def get_level(self, id_="default"):
-        if self.items is None:
-            return 0
-        res = [item["level"] for item in self.items if item["id"] == id_]
-        if isinstance(res, list) and len(res) > 0:
-            return res[0]
-        return 0
+        row = self._index.get(id_)
+        return 0 if row is None else float(self._levels[row])
+
+    def _rows(self, ids):
+        if ids is None:
+            return self._container_rows
+        return np.array([self._index[id_] for id_ in ids], dtype=int)
+
+    def get_levels(self, ids=None):
+        """Return the levels of the given ids (default all) as an array."""
+        return self._levels[self._rows(ids)]
+
+    def get_capacities(self, ids=None):
+        """Return the capacities of the given ids (default all) as an array."""
+        return self._capacities[self._rows(ids)]
+
+    def get_fill_degree(self):
+        """Return the total level divided by the total capacity of all containers."""
+        rows = self._container_rows
+        return float(self._levels[rows].sum()) / float(self._capacities[rows].sum())
+
+    def can_get_many(self, amounts):
+        """Return whether the amounts (dict per id) are available in the containers."""
+        rows = self._rows(amounts)
+        return bool(np.all(self._levels[rows] >= list(amounts.values())))
+
+    def can_put_many(self, amounts):
+        """Return whether the containers have space for the amounts (dict per id)."""
+        rows = self._rows(amounts)
+        space = self._capacities[rows] - self._levels[rows]
+        return bool(np.all(space >= list(amounts.values())))
 
     def get_container_event(self, level, operator, id_="default"):
         assert operator in ["gt", "ge", "lt", "le"], (
@@ -76,18 +188,33 @@ class EventsContainer(simpy.FilterStore):
             "from: 'gt', 'ge', 'lt', 'le'"
         )
 
-        self._container_events.setdefault((id_, level, operator), self._env.event())
-
-        event = self._container_events.get((id_, level, operator))
-        current_level = self.get_level(id_)
-        event_status = getattr(py_opp, operator)(current_level, level)
+        key = (id_, level, operator)
+        event = self._triggered_events.get(key)
+        if event is None:
+            event = self._container_events.get(key)
+        event_status = getattr(py_opp, operator)(self.get_level(id_), level)
 
-        if not event or (not event_status and event.processed):
+        if event is None or (not event_status and event.processed):
             # If event_status is still correct keep it otherwise overwrite it.
-            self._container_events[(id_, level, operator)] = self._env.event()
+            if event is not None:
+                del self._triggered_events[key]
+                self.evicted_events += 1
+            event = self._env.event()
+            if event_status:
+                event.succeed()
+                self._add_triggered(key, event)
+            else:
+                # a pending event is shared by all processes that wait for it
+                self._container_events[key] = event
+                self._add_threshold(key)
+                if len(self._container_events) > self._prune_size:
+                    self._prune_pending()
+        elif event_status and not event.triggered:
+            self._remove_pending(key)
+            event.succeed()
+            self._add_triggered(key, event)
 
-        self.update_container_events()
-        return self._container_events[(id_, level, operator)]
+        return event
 
     def get_empty_event(self, id_="default"):
         return self.get_container_event(
@@ -103,28 +230,314 @@ class EventsContainer(simpy.FilterStore):
             id_=id_,
         )
 
+    def _add_threshold(self, key):
+        """Add a pending event to the sorted thresholds of its container."""
+        id_, level, operator = key
+        rising, falling = self._thresholds.setdefault(id_, ([], []))
+        # the thresholds are ordered such that a level change fires a prefix
+        # of the list, see _fire_thresholds
+        strict = operator in ["gt", "lt"]
+        if operator in ["ge", "gt"]:
+            entry = (level, strict, next(self._counter), key)
+            bisect.insort(rising, entry)
+        else:
+            entry = (-level, strict, next(self._counter), key)
+            bisect.insort(falling, entry)
+        self._threshold_entries[key] = entry
+
+    def _remove_pending(self, key):
+        """Remove a pending event from the registry and the thresholds."""
+        del self._container_events[key]
+        entry = self._threshold_entries.pop(key)
+        pending = self._thresholds[key[0]][key[2] in ["le", "lt"]]
+        del pending[bisect.bisect_left(pending, entry)]
+
+    def _prune_pending(self):
+        """Evict the pending events that nobody waits for or refers to."""
+        events = self._container_events
+        for key in list(events):
+            # the only references are the registry and the getrefcount argument
+            if not events[key].callbacks and sys.getrefcount(events[key]) <= 2:
+                self._remove_pending(key)
+                self.evicted_events += 1
+        self._prune_size = max(64, 2 * len(events))
+
+    def _add_triggered(self, key, event):
+        """Keep a triggered event for reuse, evict the oldest beyond the bound."""
+        self._triggered_events[key] = event
+        if len(self._triggered_events) > self.max_triggered_events:
+            del self._triggered_events[next(iter(self._triggered_events))]
+            self.evicted_events += 1
+
+    def _fire_thresholds(self, id_):
+        """Succeed the pending events of id_ of which the threshold was crossed."""
+        thresholds = self._thresholds.get(id_)
+        if thresholds is None:
+            return
+        level = self.get_level(id_)
+        for pending, value in zip(thresholds, [level, -level]):
+            # (t, False) < (value, True) if t <= value, (t, True) if t < value
+            n_fired = bisect.bisect_left(pending, (value, True))
+            if n_fired:
+                fired = pending[:n_fired]
+                del pending[:n_fired]
+                for *_, key in fired:
+                    del self._threshold_entries[key]
+                    event = self._container_events.pop(key)
+                    event.succeed()
+                    self._add_triggered(key, event)
+
     def update_container_events(self):
-        for (id_, level, operator), event in self._container_events.items():
-            current_level = self.get_level(id_)
-            event_status = getattr(py_opp, operator)(current_level, level)
-            if event_status and not event.triggered:
-                event.succeed()
+        for id_ in list(self._thresholds):
+            self._fire_thresholds(id_)
 
     def put(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] + amount
-        put_event = super().put(store_status)
-        put_event.callbacks.append(self._callback)
-
-        return put_event
+        return self._change_level(amount, id_)
 
     def get(self, amount, id_="default"):
-        store_status = super().get(lambda state: state["id"] == id_).value
-        store_status["level"] = store_status["level"] - amount
-        get_event = super().put(store_status)
-        get_event.callbacks.append(self._callback)
+        return self._change_level(-amount, id_)
+
+    def put_many(self, amounts):
+        """
+        Put amounts in several containers in one atomic step.
+
+        Either all amounts are put or, if a container lacks the space, none
+        and a ValueError is raised.
+
+        Parameters
+        ----------
+        amounts
+            dict with the amount per container id.
+        """
+        return self._change_levels(amounts, sign=1)
+
+    def get_many(self, amounts):
+        """
+        Get amounts from several containers in one atomic step.
+
+        Either all amounts are taken or, if a container lacks the content,
+        none and a ValueError is raised.
+
+        Parameters
+        ----------
+        amounts
+            dict with the amount per container id.
+        """
+        return self._change_levels(amounts, sign=-1)
+
+    def _change_levels(self, amounts, sign):
+        unknown = [id_ for id_ in amounts if id_ not in self._index]
+        if unknown:
+            raise KeyError(f"Unknown container ids: {unknown}")
+        possible = self.can_put_many if sign > 0 else self.can_get_many
+        if not possible(amounts):
+            levels = dict(zip(amounts, self.get_levels(amounts).tolist()))
+            capacities = dict(zip(amounts, self.get_capacities(amounts).tolist()))
+            raise ValueError(
+                f"Cannot {'put' if sign > 0 else 'get'} {amounts} "
+                f"(levels: {levels}, capacities: {capacities})"
+            )
+
+        # change all levels before firing events, so waiting processes see
+        # the complete transfer
+        np.add.at(
+            self._levels, self._rows(amounts), sign * np.asarray(list(amounts.values()))
+        )
+        for id_ in amounts:
+            self._record_level(id_)
+            self._fire_thresholds(id_)
+            self._serve_claims(id_)
+
+        return self._done_event()
+
+    def claim_content(self, amount, id_="default", priority=0, partial=False):
+        """
+        Claim amount of the content of a container.
+
+        The claims wait in a queue, ordered by priority (lowest first) and
+        then first in first out. A claim is granted when the level, minus the
+        amounts of the granted claims, can serve it, so a level change only
+        wakes the claims it can serve. A partial claim at the head of the
+        queue is granted as soon as any content is available, with its amount
+        reduced to what is available. The granted amount cannot be granted
+        to others until the claim is released (see release_claim), e.g.
+        after the content was taken from the container.
+        """
+        return self._claim(amount, id_, "content", priority, partial=partial)
+
+    def claim_space(self, amount, id_="default", priority=0, partial=False):
+        """Claim amount of the free space of a container, see claim_content."""
+        return self._claim(amount, id_, "space", priority, partial=partial)
+
+    def reduce_claim(self, claim, amount):
+        """Reduce the amount of a claim, the rest can be granted to others."""
+        if claim.triggered and not claim.released:
+            self._claimed[(claim.id_, claim.kind)] -= claim.amount - amount
+        claim.amount = amount
+        self._serve_claims(claim.id_)
+
+    def release_claim(self, claim):
+        """Release a granted claim, or withdraw a claim that is still waiting."""
+        if claim.released:
+            return
+        claim.released = True
+        key = (claim.id_, claim.kind)
+        if claim.triggered:
+            self._claimed[key] -= claim.amount
+        self._serve_claims(claim.id_)
+
+    def requeue_claim(self, claim, amount=None):
+        """
+        Put a claim back in its queue, at its original position.
+
+        The claim is released and a new claim with the same priority and
+        place in the queue is returned, e.g. to wait again when the claimed
+        content was taken by a get that did not claim it.
+
+        Parameters
+        ----------
+        claim
+            The claim to put back.
+        amount
+            The amount of the new claim, by default the amount of claim.
+        """
+        if amount is None:
+            amount = claim.amount
+        if not claim.triggered:
+            # still waiting in its queue, only the amount changes
+            claim.amount = amount
+            self._serve_claims(claim.id_)
+            return claim
+
+        # release without serving the claims behind it first
+        claim.released = True
+        self._claimed[(claim.id_, claim.kind)] -= claim.amount
+        return self._claim(
+            amount, claim.id_, claim.kind, claim.priority, claim.partial, claim.seq
+        )
+
+    def _claim(self, amount, id_, kind, priority, partial=False, seq=None):
+        claim = ContainerClaim(self._env, amount, id_, kind, priority, partial)
+        claim.seq = next(self._counter) if seq is None else seq
+        key = (id_, kind)
+        self._claimed.setdefault(key, 0)
+        heapq.heappush(
+            self._claim_queues.setdefault(key, []), (priority, claim.seq, claim)
+        )
+        self._serve_claims(id_)
+        return claim
+
+    def _available(self, id_, kind):
+        claimed = self._claimed[(id_, kind)]
+        if kind == "content":
+            return self.get_level(id_) - claimed
+        return self.get_capacity(id_) - self.get_level(id_) - claimed
+
+    def _serve_claims(self, id_):
+        """Grant the claims at the head of the queues of id_ that can be served."""
+        for kind in ["content", "space"]:
+            queue = self._claim_queues.get((id_, kind))
+            while queue:
+                claim = queue[0][-1]
+                if claim.released:
+                    # withdrawn while waiting
+                    heapq.heappop(queue)
+                    continue
+                available = self._available(id_, kind)
+                if available < claim.amount:
+                    if not (claim.partial and available > 0):
+                        break
+                    claim.amount = available
+                heapq.heappop(queue)
+                self._claimed[(id_, kind)] += claim.amount
+                claim.succeed(claim.amount)
+
+    def put_reservation(self, amount, id_="default"):
+        """
+        Add amount to the reservations of a container.
+
+        The reserved level of id_ is kept as the level of
+        f"{id_}_reservations". Unlike put, no simpy event is created; events
+        are only scheduled for processes that wait on the reserved level.
+        """
+        self._change_reservation(amount, id_)
+
+    def get_reservation(self, amount, id_="default"):
+        """Remove amount from the reservations of a container, see put_reservation."""
+        self._change_reservation(-amount, id_)
+
+    def _change_reservation(self, amount, id_):
+        key = f"{id_}_reservations"
+        self._levels[self._index[key]] += amount
+        self._fire_thresholds(key)
+
+    def _change_level(self, amount, id_):
+        self._levels[self._index[id_]] += amount
+        self._record_level(id_)
+        self._fire_thresholds(id_)
+        self._serve_claims(id_)
+
+        return self._done_event()
+
+    def _record_level(self, id_):
+        """Record the level of a container at the current time."""
+        if not self.record_levels or id_ not in self._container_ids_set:
+            return
+        times, levels = self._level_series.setdefault(
+            id_, (array.array("d"), array.array("d"))
+        )
+        now = self._env.now
+        level = self._levels[self._index[id_]]
+        if times and times[-1] == now:
+            # keep one change point per time
+            levels[-1] = level
+        else:
+            times.append(now)
+            levels.append(level)
+
+    def get_level_series(self, id_="default"):
+        """
+        Return the times and levels at which the level of a container changed.
+
+        The level holds from each time until the next one. Times are the
+        simulation times (seconds since 1970 in utc), both are numpy arrays.
+        """
+        times, levels = self._level_series.get(
+            id_, (array.array("d"), array.array("d"))
+        )
+        return np.asarray(times), np.asarray(levels)
+
+    def _done_event(self):
+        """Return the event of a put or get, which has already succeeded."""
+        event = self._env.event()
+        event.succeed()
+        return event
+
+
+class _ProcessedEvent(simpy.Event):
+    """Event that has already been processed, a process that yields it continues."""
+
+    def __init__(self, env):
+        super().__init__(env)
+        self._ok = True
+        self._value = None
+        self.callbacks = None
+
+
+class DirectLevelContainer(EventsContainer):
+    """
+    EventsContainer that does not schedule events for puts and gets.
+
+    Use it for sites that no process waits on for a put or get, e.g.
+    stockpiles and buffer sites, with ``HasContainer(container_class=...)``.
+    put and get change the level and return an event that has already been
+    processed, so a process that yields it continues without a simpy step.
+    Level events and claims are only created when they are requested.
+    """
 
-        return get_event
+    def __init__(self, env, *args, **kwargs):
+        super().__init__(env, *args, **kwargs)
+        self._done = _ProcessedEvent(env)
 
-    def _callback(self, event, id_="default"):
-        self.update_container_events()
+    def _done_event(self):
+        return self._done
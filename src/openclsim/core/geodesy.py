@@ -0,0 +1,231 @@
+"""Geodesic computations shared by the locatable and movable objects."""
+
+import numpy as np
+import pyproj
+import shapely
+import shapely.geometry
+from shapely.geometry.base import BaseGeometry
+
+# we only have one earth, defined here.
+WGS84 = pyproj.Geod(ellps="WGS84")
+
+
+class DistanceCache:
+    """
+    Bounded cache of geodesic distances between pairs of geometry objects.
+
+    Shapely geometries are immutable, so the cache is keyed on the identity
+    of both geometries; a lookup only hashes two ints, which is cheaper than
+    the geodesic inverse itself. Cyclic simulations reuse the geometry
+    objects of their sites (a Movable takes over the geometry of its
+    destination), so their distances are found in the cache. The geometries
+    are kept alive while their distance is cached, so their ids can not be
+    reused. Beyond maxsize the oldest distance is evicted.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of cached distances.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._distances = {}
+
+    def __len__(self):
+        return len(self._distances)
+
+    def distance(self, origin, destination):
+        """Return the geodesic distance in meters between two shapely points."""
+        key = (id(origin), id(destination))
+        cached = self._distances.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached[2]
+
+        self.misses += 1
+        _, _, distance = WGS84.inv(origin.x, origin.y, destination.x, destination.y)
+        self._distances[key] = (origin, destination, distance)
+        if len(self._distances) > self.maxsize:
+            del self._distances[next(iter(self._distances))]
+        return distance
+
+    def clear(self):
+        """Remove all cached distances and reset the counters."""
+        self._distances.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# process-wide cache, used by Locatable.is_at and Movable.compute_distance
+distance_cache = DistanceCache()
+
+
+def geodesic_distance(origin, destination):
+    """
+    Return the (cached) geodesic distance in meters between two points.
+
+    Parameters
+    ----------
+    origin
+        Shapely point or geojson-like geometry, in wgs84 lon, lat.
+    destination
+        Shapely point or geojson-like geometry, in wgs84 lon, lat.
+    """
+    if not isinstance(origin, BaseGeometry) or not isinstance(
+        destination, BaseGeometry
+    ):
+        # converted geometries are new objects, which are not worth caching
+        origin = shapely.geometry.shape(origin)
+        destination = shapely.geometry.shape(destination)
+        _, _, distance = WGS84.inv(origin.x, origin.y, destination.x, destination.y)
+        return distance
+    return distance_cache.distance(origin, destination)
+
+
+def geodesic_distances(origin, destinations):
+    """
+    Return the geodesic distances in meters from one point to many points.
+
+    The distances are computed in one vectorized WGS84.inv call.
+
+    Parameters
+    ----------
+    origin
+        Shapely point, in wgs84 lon, lat.
+    destinations
+        Sequence (or array) of shapely points, in wgs84 lon, lat.
+    """
+    if not isinstance(origin, BaseGeometry):
+        origin = shapely.geometry.shape(origin)
+    destinations = np.asarray(destinations, dtype=object)
+    x, y = shapely.get_x(destinations), shapely.get_y(destinations)
+    _, _, distances = WGS84.inv(
+        np.full(len(x), origin.x), np.full(len(y), origin.y), x, y
+    )
+    return np.asarray(distances)
+
+
+class DistanceMatrix:
+    """
+    Matrix of the geodesic distances between all pairs of a set of sites.
+
+    The distances are computed before the simulation, in one vectorized
+    WGS84.inv call. Assign the matrix to the environment
+    (``env.distance_matrix = DistanceMatrix(sites)``) to have
+    Movable.compute_duration look up the distance between two sites instead
+    of computing it. Moves from or to other locations are computed as usual.
+
+    Parameters
+    ----------
+    sites
+        Locatable objects (with a point geometry) of which the distances are
+        computed.
+    precision
+        Number of decimals of the coordinates used to find a site.
+    """
+
+    def __init__(self, sites, precision: int = 7):
+        self.sites = list(sites)
+        self.precision = precision
+
+        x = np.array([site.geometry.x for site in self.sites], dtype=float)
+        y = np.array([site.geometry.y for site in self.sites], dtype=float)
+        n = len(self.sites)
+        _, _, distances = WGS84.inv(
+            np.repeat(x, n), np.repeat(y, n), np.tile(x, n), np.tile(y, n)
+        )
+        self.distances = np.asarray(distances).reshape(n, n)
+
+        self.index = {}
+        for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist())):
+            self.index.setdefault(self._key(xi, yi), i)
+
+    def _key(self, x, y):
+        return round(x, self.precision), round(y, self.precision)
+
+    def __len__(self):
+        return len(self.sites)
+
+    def distance(self, origin, destination):
+        """Return the distance between two points, or None if one is not a site."""
+        if not isinstance(origin, BaseGeometry):
+            origin = shapely.geometry.shape(origin)
+        if not isinstance(destination, BaseGeometry):
+            destination = shapely.geometry.shape(destination)
+        i = self.index.get(self._key(origin.x, origin.y))
+        j = self.index.get(self._key(destination.x, destination.y))
+        if i is None or j is None:
+            return None
+        return self.distances[i, j].item()
+
+    def durations(self, v):
+        """Return the matrix of the durations of the moves with speed v."""
+        return self.distances / v
+
+
+def _cache_edge(graph, a, b, edge):
+    """Compute the geodesic length and both orientations of an edge geometry."""
+    geometry = edge["geometry"]
+    start = shapely.geometry.Point(geometry.coords[0])
+    end = shapely.geometry.Point(geometry.coords[-1])
+    reverse = shapely.reverse(geometry)
+    geometry_from = {}
+    for node in (a, b):
+        node_geometry = graph.nodes[node]["geometry"]
+        # same rule as Routable.order_geometry: start at the nearest end
+        _, _, distance_from_start = WGS84.inv(
+            start.x, start.y, node_geometry.x, node_geometry.y
+        )
+        _, _, distance_from_end = WGS84.inv(
+            end.x, end.y, node_geometry.x, node_geometry.y
+        )
+        if distance_from_start > distance_from_end:
+            geometry_from[node] = reverse
+        else:
+            geometry_from[node] = geometry
+    edge["geodesic_length"] = WGS84.geometry_length(geometry)
+    edge["geometry_from"] = geometry_from
+
+
+def cache_edge_geometries(graph):
+    """
+    Store the geodesic length and both orientations of every edge on graph.
+
+    Every edge gets a ``geodesic_length`` attribute (in meters) and a
+    ``geometry_from`` attribute, a dict with the edge geometry starting at
+    each of the two nodes of the edge. Routable reads these instead of
+    recomputing them for every move. Edges that are not cached up front are
+    cached the first time they are sailed. Call again (or remove the
+    attributes of an edge) after changing edge geometries.
+
+    Parameters
+    ----------
+    graph
+        networkx graph with a geometry on all nodes and edges.
+    """
+    for a, b, edge in graph.edges(data=True):
+        _cache_edge(graph, a, b, edge)
+
+
+def edge_geometry(graph, a, b):
+    """
+    Return the geometry of edge (a, b) starting at a and its geodesic length.
+
+    Parameters
+    ----------
+    graph
+        networkx graph with a geometry on all nodes and edges.
+    a
+        Node the geometry starts at.
+    b
+        Node the geometry ends at.
+    """
+    edge = graph.edges[a, b]
+    geometry_from = edge.get("geometry_from")
+    if geometry_from is None or a not in geometry_from:
+        _cache_edge(graph, a, b, edge)
+        geometry_from = edge["geometry_from"]
+    return geometry_from[a], edge["geodesic_length"]
@@ -4,6 +4,65 @@ import uuid
 import warnings
 from typing import Optional
 
+import numpy as np
+
+
+class IdTable:
+    """
+    Intern table that maps the (uuid) ids of objects and activities to integers.
+
+    One table is kept per simpy environment (see get_id_table). The logs
+    store the compact integer codes and decode them to ids or names only when
+    they are presented.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self._index = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def intern(self, id_, name=None):
+        """Return the integer code of id_, adding it to the table if needed."""
+        code = self._index.get(id_)
+        if code is None:
+            code = len(self.ids)
+            self._index[id_] = code
+            self.ids.append(id_)
+            self.names.append(name)
+        elif name is not None:
+            self.names[code] = name
+        return code
+
+    def code(self, id_):
+        """Return the integer code of id_, or None if it is not in the table."""
+        return self._index.get(id_)
+
+    def decode(self, codes):
+        """Return the ids of the given codes as a numpy array."""
+        ids = np.empty(len(self.ids), dtype=object)
+        ids[:] = self.ids
+        return ids[np.asarray(codes, dtype=int)]
+
+    def decode_names(self, codes):
+        """Return the names of the given codes, or the id if it has no name."""
+        names = np.empty(len(self.ids), dtype=object)
+        names[:] = [
+            id_ if name is None else name for id_, name in zip(self.ids, self.names)
+        ]
+        return names[np.asarray(codes, dtype=int)]
+
+
+def get_id_table(env):
+    """Return the IdTable of a simpy environment, create it if needed."""
+    id_table = getattr(env, "id_table", None)
+    if id_table is None:
+        id_table = IdTable()
+        env.id_table = id_table
+    return id_table
+
 
 class Identifiable:
     """
@@ -21,6 +80,9 @@ class Identifiable:
     tags
         List of tags that can be used to identify objects.
         Note that this field does not influence the simulation.
+
+    If the object has a simpy environment, its id is interned in the IdTable
+    of the environment and the integer code is available as id_code.
     """
 
     def __init__(self, name: str, id: Optional[str] = None, *args, **kwargs):
@@ -39,3 +101,8 @@ class Identifiable:
         super().__init__(*args, **kwargs)
         self.name = name
         self.id = id if id else str(uuid.uuid4())
+
+        # register the id in the intern table of the environment
+        env = getattr(self, "env", None)
+        if env is not None:
+            self.id_code = get_id_table(env).intern(self.id, self.name)
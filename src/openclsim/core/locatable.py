@@ -1,11 +1,13 @@
 """Component to locate the simulation objects."""
 
+import operator
 from typing import Optional
 
-import pyproj
-import shapely.geometry
 from shapely.geometry.base import BaseGeometry
 
+from .geodesy import WGS84, geodesic_distance, geodesic_distances
+from .state import OMIT, get_state
+
 
 class Locatable:
     """Something with a geometry (geojson format). Can be a point as well as a
@@ -29,25 +31,57 @@ class Locatable:
         self.geometry = geometry
         # an optional node for locating an object on a network
         self.node = node
-        # used for distance computation
-        self.wgs84 = pyproj.Geod(ellps="WGS84")
 
-    def is_at(self, locatable, tolerance=100):
-        current_location = shapely.geometry.shape(self.geometry)
-        other_location = shapely.geometry.shape(locatable.geometry)
-        _, _, distance = self.wgs84.inv(
-            current_location.x, current_location.y, other_location.x, other_location.y
-        )
+        spatial_index = getattr(getattr(self, "env", None), "spatial_index", None)
+        if spatial_index is not None:
+            spatial_index.add(self)
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry):
+        self._geometry = geometry
+        # keep the spatial index of the environment up to date when moving
+        spatial_index = getattr(getattr(self, "env", None), "spatial_index", None)
+        if spatial_index is not None:
+            spatial_index.update(self)
 
+    # used for distance computation, one geodesic engine for all locatables
+    wgs84 = WGS84
+
+    def is_at(self, locatable, tolerance=100):
+        distance = geodesic_distance(self.geometry, locatable.geometry)
         return distance < tolerance
 
-    def get_state(self):
-        state = {}
-        if hasattr(super(), "get_state"):
-            state = super().get_state()
+    def distance_to_many(self, locations):
+        """
+        Return the geodesic distances in meters to many locations at once.
+
+        Parameters
+        ----------
+        locations
+            Sequence of Locatable objects or shapely points.
+        """
+        geometries = [getattr(location, "geometry", location) for location in locations]
+        return geodesic_distances(self.geometry, geometries)
+
+    def is_at_many(self, locations, tolerance=100):
+        """
+        Return a boolean array that tells at which of the locations this object is.
 
-        state.update({"geometry": self.geometry})
-        if self.node is not None:
-            state["node"] = self.node
+        Parameters
+        ----------
+        locations
+            Sequence of Locatable objects or shapely points.
+        tolerance
+            Maximum distance in meters, see is_at.
+        """
+        return self.distance_to_many(locations) < tolerance
 
-        return state
+    state_fields = (
+        ("geometry", operator.attrgetter("geometry")),
+        ("node", lambda self: OMIT if self.node is None else self.node),
+    )
+    get_state = get_state
@@ -0,0 +1,906 @@
+"""Storage backends for the log of the simulation objects."""
+
+import array
+import datetime
+import pathlib
+import pickle
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .identifiable import IdTable, get_id_table
+from .log import LogState, _to_datetime64, _to_datetimes
+
+# lookup of the LogState names by their integer value
+_STATE_NAMES = {state.value: state.name for state in LogState}
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only required to stream logs to a file."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Streaming the log to a file requires pyarrow, "
+            "install it with `pip install pyarrow`."
+        ) from e
+    return pyarrow
+
+
+class _Logbook(Sequence):
+    """Base class of the logbook backends that are not a plain list."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._records(*index.indices(len(self)))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("logbook index out of range")
+        return self._records(index, index + 1)[0]
+
+    def __iter__(self):
+        yield from self._records(0, len(self))
+
+    def _records(self, start, stop, step=1):
+        indices = range(start, stop, step)
+        if not indices:
+            return []
+        first = min(indices[0], indices[-1])
+        log = self._raw_format(start=first)
+        records = [dict(zip(log, values)) for values in zip(*log.values())]
+        return [records[i - first] for i in indices]
+
+    def _raw_format(self, start=0):
+        """Return the entries from start onwards in log format, with float timestamps."""
+        raise NotImplementedError
+
+    def to_log_format(self, start=0):
+        """
+        Return the entries from start onwards in log format.
+
+        The log format is a dict of lists with the columns Timestamp,
+        ActivityID, ActivityState, ObjectState and ActivityLabel. The
+        timestamps are converted to datetimes in one vectorized step.
+        """
+        log = self._raw_format(start=start)
+        log["Timestamp"] = _to_datetimes(log["Timestamp"])
+        return log
+
+    def append(self, entry):
+        """Append a record oriented entry (compatible with list.append)."""
+        if "Message" in entry:
+            raise TypeError(
+                f"{type(self).__name__} only supports openclsim (log_entry_v1) entries"
+            )
+        timestamp = entry["Timestamp"]
+        if isinstance(timestamp, datetime.datetime):
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc).timestamp()
+        self.append_v1(
+            timestamp,
+            entry.get("ActivityID"),
+            LogState[entry.get("ActivityState", LogState.UNKNOWN.name)],
+            entry.get("ObjectState", {}),
+            entry.get("ActivityLabel"),
+        )
+
+
+class ColumnarLogbook(_Logbook):
+    """
+    Column oriented logbook backed by typed, growable arrays.
+
+    The ColumnarLogbook can be used instead of the default record oriented
+    list, either per object (``logbook_class=ColumnarLogbook``) or for all
+    objects of an environment (``env.logbook_class = ColumnarLogbook``).
+    Timestamps are stored as floats, the activity state as the integer value
+    of the LogState and activity ids and labels are interned and referenced
+    by index. Object states are stored as snapshots; an entry with the same
+    state as the previous entry only stores a reference to its snapshot.
+    Records are only rebuilt when they are accessed.
+
+    Parameters
+    ----------
+    id_table
+        The IdTable used to intern the activity ids. The Log passes the table
+        of its environment, so the codes are shared by all objects.
+    """
+
+    # Log passes the IdTable of the environment to logbooks that set this
+    uses_id_table = True
+
+    def __init__(self, id_table: Optional[IdTable] = None):
+        self.id_table = id_table if id_table is not None else IdTable()
+        self._timestamps = array.array("d")
+        self._activity_ids = array.array("l")
+        self._activity_states = array.array("b")
+        self._activity_labels = array.array("l")
+        self._object_states = array.array("l")
+        self._snapshots = []
+        # 1 for the entries of which the state equals the snapshot
+        self._state_copies = array.array("b")
+
+        # interned activity labels, the empty label is always at 0
+        self._labels = [{}]
+        self._label_index = {(): 0}
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def _records(self, start, stop, step=1):
+        return [self._record(i) for i in range(start, stop, step)]
+
+    def _record(self, i):
+        return {
+            "Timestamp": self._timestamps[i],
+            "ActivityID": self.id_table.ids[self._activity_ids[i]],
+            "ActivityState": _STATE_NAMES[self._activity_states[i]],
+            "ObjectState": self._object_state(i),
+            "ActivityLabel": dict(self._labels[self._activity_labels[i]]),
+        }
+
+    def _object_state(self, i):
+        snapshot = self._snapshots[self._object_states[i]]
+        return dict(snapshot) if self._state_copies[i] else snapshot
+
+    def _intern_label(self, activity_label):
+        if not activity_label:
+            return 0
+        try:
+            key = tuple(activity_label.items())
+            index = self._label_index.get(key)
+        except TypeError:
+            # labels with unhashable values are stored without interning
+            key, index = None, None
+        if index is None:
+            index = len(self._labels)
+            self._labels.append(dict(activity_label))
+            if key is not None:
+                self._label_index[key] = index
+        return index
+
+    def append_v1(
+        self, t, activity_id, activity_state, object_state, activity_label=None
+    ):
+        """
+        Append an entry (openclsim version) without building the record.
+
+        Parameters
+        ----------
+        t : float
+            Timestamp in seconds since 1970 in utc.
+        activity_id : Union[str, int, None]
+            Identifier of the activity.
+        activity_state : LogState
+            State of the activity.
+        object_state : dict
+            State of the object.
+        activity_label : Optional[dict], optional
+            Label of the activity, by default None
+        """
+        self._timestamps.append(t)
+        self._activity_ids.append(self.id_table.intern(activity_id))
+        self._activity_states.append(activity_state.value)
+        self._activity_labels.append(self._intern_label(activity_label))
+        # an unchanged state refers to the previous snapshot, an equal state
+        # that is a different object is handed out as a copy of it
+        snapshots = self._snapshots
+        if snapshots and object_state is snapshots[-1]:
+            self._state_copies.append(0)
+        elif snapshots and object_state == snapshots[-1]:
+            self._state_copies.append(1)
+        else:
+            snapshots.append(object_state)
+            self._state_copies.append(0)
+        self._object_states.append(len(snapshots) - 1)
+
+    def _raw_format(self, start=0):
+        return self._raw_rows(range(start, len(self)))
+
+    def _raw_rows(self, rows):
+        """Return the entries at the given row numbers in (raw) log format."""
+        ids = self.id_table.ids
+        labels = self._labels
+        return {
+            "Timestamp": [self._timestamps[i] for i in rows],
+            "ActivityID": [ids[self._activity_ids[i]] for i in rows],
+            "ActivityState": [_STATE_NAMES[self._activity_states[i]] for i in rows],
+            "ObjectState": [self._object_state(i) for i in rows],
+            "ActivityLabel": [dict(labels[self._activity_labels[i]]) for i in rows],
+        }
+
+    def to_dataframe(self, rows=None, decode_ids=True):
+        """
+        Return the entries as a pandas DataFrame, built with vectorized lookups.
+
+        Parameters
+        ----------
+        rows
+            Row numbers of the entries to return, by default all entries.
+        decode_ids
+            If False, the ActivityID column holds the integer codes of the
+            IdTable instead of the ids, which is faster to join on.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        rows = np.asarray(rows, dtype=int)
+
+        def lookup(table, references):
+            values = np.empty(len(table), dtype=object)
+            values[:] = table
+            return values[np.asarray(references)[rows]]
+
+        codes = np.asarray(self._activity_ids)[rows]
+        states = np.asarray(self._activity_states)[rows]
+        return pd.DataFrame(
+            {
+                "Timestamp": _to_datetime64(np.asarray(self._timestamps)[rows]),
+                "ActivityID": self.id_table.decode(codes) if decode_ids else codes,
+                "ActivityState": pd.Series(states).map(_STATE_NAMES).to_numpy(),
+                "ObjectState": lookup(self._snapshots, self._object_states),
+                "ActivityLabel": lookup(self._labels, self._activity_labels),
+            }
+        )
+
+
+class EventTable:
+    """
+    Append-only table with the log entries of all objects of an environment.
+
+    Opt in by setting ``env.event_table = core.EventTable()`` before the
+    simulation objects are created. The logbook of each object is then a
+    view on its own rows of this table, and analyses over all objects can
+    use a single DataFrame (see to_dataframe) instead of concatenating the
+    logs of the individual objects.
+
+    Parameters
+    ----------
+    id_table
+        The IdTable used to intern the activity ids. By default the IdTable of
+        the environment of the first registered object is used.
+    """
+
+    def __init__(self, id_table: Optional[IdTable] = None):
+        self.entries = ColumnarLogbook(id_table)
+        self.owners = array.array("l")
+        self.objects = []
+        self._bound = id_table is not None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def id_table(self):
+        return self.entries.id_table
+
+    def register(self, obj):
+        """Register a Log object and return its owner key."""
+        if not self._bound and len(self) == 0:
+            self.entries.id_table = get_id_table(obj.env)
+            self._bound = True
+        self.objects.append(obj)
+        return len(self.objects) - 1
+
+    def append_v1(
+        self,
+        owner,
+        t,
+        activity_id,
+        activity_state,
+        object_state,
+        activity_label=None,
+    ):
+        """Append an entry of the given owner and return its row number."""
+        self.owners.append(owner)
+        self.entries.append_v1(
+            t, activity_id, activity_state, object_state, activity_label
+        )
+        return len(self.owners) - 1
+
+    def to_dataframe(self, objects=None, decode_ids=True):
+        """
+        Return the entries of all (or the given) objects as a pandas DataFrame.
+
+        Next to the columns of the log, the DataFrame has the columns
+        ObjectID and ObjectName of the object that logged the entry.
+
+        Parameters
+        ----------
+        objects
+            Only return the entries of these objects, by default all entries.
+        decode_ids
+            If False, the ActivityID column holds the integer codes of the
+            IdTable instead of the ids (see ColumnarLogbook.to_dataframe).
+        """
+        owners = np.asarray(self.owners, dtype=int)
+        if objects is None:
+            rows = np.arange(len(owners))
+        else:
+            wanted = {id(obj) for obj in objects}
+            keys = [key for key, obj in enumerate(self.objects) if id(obj) in wanted]
+            rows = np.flatnonzero(np.isin(owners, keys))
+
+        object_ids = np.empty(len(self.objects), dtype=object)
+        object_ids[:] = [getattr(obj, "id", None) for obj in self.objects]
+        object_names = np.empty(len(self.objects), dtype=object)
+        object_names[:] = [getattr(obj, "name", None) for obj in self.objects]
+
+        df = self.entries.to_dataframe(rows, decode_ids=decode_ids)
+        df.insert(0, "ObjectName", object_names[owners[rows]])
+        df.insert(0, "ObjectID", object_ids[owners[rows]])
+        return df
+
+
+class TableLogbook(_Logbook):
+    """
+    Logbook that is a view on the entries of one object in an EventTable.
+
+    Parameters
+    ----------
+    table
+        The EventTable that stores the entries.
+    obj
+        The Log object that owns this logbook.
+    """
+
+    def __init__(self, table, obj):
+        self.table = table
+        self.owner = table.register(obj)
+        self.rows = array.array("l")
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _records(self, start, stop, step=1):
+        entries = self.table.entries
+        return [entries._record(self.rows[i]) for i in range(start, stop, step)]
+
+    def append_v1(
+        self, t, activity_id, activity_state, object_state, activity_label=None
+    ):
+        """Append an entry (openclsim version), see ColumnarLogbook.append_v1."""
+        self.rows.append(
+            self.table.append_v1(
+                self.owner,
+                t,
+                activity_id,
+                activity_state,
+                object_state,
+                activity_label,
+            )
+        )
+
+    def _raw_format(self, start=0):
+        return self.table.entries._raw_rows(self.rows[start:])
+
+
+class SinkLogbook(_Logbook):
+    """
+    Logbook that streams its entries to a LogSink.
+
+    The entries are not kept in memory, but are read back from the file of
+    the sink when the logbook or the log of the object is accessed.
+
+    Parameters
+    ----------
+    sink
+        The LogSink that stores the entries.
+    """
+
+    # Log does not keep a copy of the log format of this logbook in memory
+    cache_log = False
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.owner = sink.register()
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append_v1(
+        self, t, activity_id, activity_state, object_state, activity_label=None
+    ):
+        """Append an entry (openclsim version), see ColumnarLogbook.append_v1."""
+        self.sink.write(
+            self.owner, t, activity_id, activity_state, object_state, activity_label
+        )
+        self._length += 1
+
+    def _raw_format(self, start=0):
+        table = self.sink.read(owner=self.owner)
+        table = table.slice(start).to_pydict()
+        return {
+            "Timestamp": table["Timestamp"],
+            "ActivityID": table["ActivityID"],
+            "ActivityState": table["ActivityState"],
+            "ObjectState": [pickle.loads(state) for state in table["ObjectState"]],
+            "ActivityLabel": [pickle.loads(label) for label in table["ActivityLabel"]],
+        }
+
+
+class LogSink:
+    """
+    Base class of the sinks that stream log entries to a local file.
+
+    A sink can be passed to a single object (``log_sink=sink``) or to all
+    objects of an environment (``env.log_sink = sink``). The entries of all
+    objects that share a sink are written to the same file, with an Owner
+    column to tell them apart. Entries are buffered and written to the file
+    in chunks of buffer_size entries while the simulation runs, so the memory
+    that is used for the log is bounded by the buffer size.
+
+    Object states and activity labels are pickled, activity ids are stored
+    as strings. Call close() after the simulation to finalize the file.
+
+    The log can be read while the simulation runs. The entries that are not
+    in a finalized file yet are kept in memory until their file is finalized,
+    which happens every part_size entries, so the memory that is used for the
+    log is bounded by the part size. The entries of the finalized files are
+    read from disk at every read, they are not kept in memory.
+
+    Parameters
+    ----------
+    path
+        Path of the file to write to. Every part_size entries the file is
+        finalized and the next entries are written to an additional file
+        next to it (``<name>.1<suffix>``, ...).
+    buffer_size
+        Number of entries that are buffered before they are written.
+    part_size
+        Number of entries after which a file is finalized.
+    """
+
+    def __init__(self, path, buffer_size: int = 10_000, part_size: int = 100_000):
+        self.path = pathlib.Path(path)
+        self.buffer_size = buffer_size
+        self.part_size = part_size
+        self.n_owners = 0
+        self.parts = []
+
+        self._buffer = self._empty_buffer()
+        self._writer = None
+        # tables written to the open part, which can not be read from disk yet
+        self._open_tables = []
+        self._open_rows = 0
+
+    @staticmethod
+    def _empty_buffer():
+        return {
+            "Owner": [],
+            "Timestamp": [],
+            "ActivityID": [],
+            "ActivityState": [],
+            "ObjectState": [],
+            "ActivityLabel": [],
+        }
+
+    @staticmethod
+    def _schema():
+        pa = _import_pyarrow()
+        return pa.schema(
+            [
+                ("Owner", pa.int32()),
+                ("Timestamp", pa.float64()),
+                ("ActivityID", pa.string()),
+                ("ActivityState", pa.string()),
+                ("ObjectState", pa.binary()),
+                ("ActivityLabel", pa.binary()),
+            ]
+        )
+
+    def register(self):
+        """Register a logbook and return its owner key."""
+        owner = self.n_owners
+        self.n_owners += 1
+        return owner
+
+    def write(
+        self, owner, t, activity_id, activity_state, object_state, activity_label=None
+    ):
+        """Buffer an entry and flush the buffer when it is full."""
+        buffer = self._buffer
+        buffer["Owner"].append(owner)
+        buffer["Timestamp"].append(t)
+        buffer["ActivityID"].append(None if activity_id is None else str(activity_id))
+        buffer["ActivityState"].append(activity_state.name)
+        buffer["ObjectState"].append(pickle.dumps(object_state))
+        buffer["ActivityLabel"].append(pickle.dumps(activity_label or {}))
+
+        if len(buffer["Owner"]) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered entries to the file."""
+        if not self._buffer["Owner"]:
+            return
+
+        pa = _import_pyarrow()
+        table = pa.table(self._buffer, schema=self._schema())
+        if self._writer is None:
+            n_parts = len(self.parts)
+            part = (
+                self.path
+                if n_parts == 0
+                else self.path.with_name(
+                    f"{self.path.stem}.{n_parts}{self.path.suffix}"
+                )
+            )
+            self.parts.append(part)
+            self._writer = self._open_writer(part, table.schema)
+        self._writer.write_table(table)
+        self._open_tables.append(table)
+        self._open_rows += table.num_rows
+        self._buffer = self._empty_buffer()
+
+        if self._open_rows >= self.part_size:
+            self._finalize_part()
+
+    def _finalize_part(self):
+        """Finalize the open file, its entries are then read from disk."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._open_tables = []
+        self._open_rows = 0
+
+    def close(self):
+        """Flush the buffer and finalize the file."""
+        self.flush()
+        self._finalize_part()
+
+    @staticmethod
+    def _filter(table, owner):
+        if owner is None:
+            return table
+
+        import pyarrow.compute
+
+        return table.filter(pyarrow.compute.equal(table["Owner"], owner))
+
+    def read(self, owner=None):
+        """
+        Read the entries back as a pyarrow Table.
+
+        Reading does not finalize the file, the entries that are not in a
+        finalized file yet are taken from memory.
+
+        Parameters
+        ----------
+        owner
+            Only return the entries of this owner, by default all entries.
+        """
+        pa = _import_pyarrow()
+
+        # the finalized parts are read from disk, they are not kept in memory
+        n_finalized = len(self.parts) - (self._writer is not None)
+        tables = [self._read_part(part, owner) for part in self.parts[:n_finalized]]
+
+        pending = list(self._open_tables)
+        if self._buffer["Owner"]:
+            pending.append(pa.table(self._buffer, schema=self._schema()))
+        tables.extend(self._filter(table, owner) for table in pending)
+        return pa.concat_tables(tables or [self._schema().empty_table()])
+
+    def _open_writer(self, path, schema):
+        raise NotImplementedError
+
+    def _read_part(self, path, owner=None):
+        raise NotImplementedError
+
+
+class ParquetLogSink(LogSink):
+    """LogSink that writes each buffer as a row group to a Parquet file."""
+
+    def _open_writer(self, path, schema):
+        import pyarrow.parquet
+
+        return pyarrow.parquet.ParquetWriter(path, schema)
+
+    def _read_part(self, path, owner=None):
+        import pyarrow.parquet
+
+        # the row groups of other owners are skipped on their statistics
+        filters = None if owner is None else [("Owner", "==", owner)]
+        return pyarrow.parquet.read_table(path, filters=filters)
+
+
+class ArrowLogSink(LogSink):
+    """LogSink that writes each buffer as record batches to an Arrow IPC file."""
+
+    def _open_writer(self, path, schema):
+        pa = _import_pyarrow()
+        return pa.ipc.new_file(path, schema)
+
+    def _read_part(self, path, owner=None):
+        pa = _import_pyarrow()
+        with pa.ipc.open_file(path) as reader:
+            return self._filter(reader.read_all(), owner)
+
+
+# fixed-width record of a LogFile, object states and activity labels are
+# references into the pickled tables of the file
+_RECORD_DTYPE = np.dtype(
+    [
+        ("Timestamp", "<f8"),
+        ("Object", "<i4"),
+        ("ActivityID", "<i4"),
+        ("ActivityState", "i1"),
+        ("ObjectState", "<i4"),
+        ("ActivityLabel", "<i4"),
+    ]
+)
+
+
+def _group_index(codes, n_groups):
+    """Return the row numbers grouped by code, and the offsets of each group."""
+    order = np.argsort(codes, kind="stable").astype("<i8")
+    offsets = np.zeros(n_groups + 1, dtype="<i8")
+    np.cumsum(np.bincount(codes, minlength=n_groups), out=offsets[1:])
+    return order, offsets
+
+
+def _to_float_time(t):
+    if isinstance(t, datetime.datetime):
+        return t.replace(tzinfo=datetime.timezone.utc).timestamp()
+    return t
+
+
+class LogFile:
+    """
+    Compact binary file with the logs of simulation objects.
+
+    A LogFile is a directory with a fixed-width record file, sorted by time,
+    and indexes with the rows of each object and each activity. The records
+    and indexes are opened with mmap, so queries (see rows and to_dataframe)
+    only read the records they return instead of loading the whole run.
+    Object states and activity labels are stored once in a pickled table and
+    referenced by the records.
+
+    Write a LogFile with LogFile.save. A logbook of one object
+    (see logbook) can be assigned to a Log object to read its log back.
+
+    Parameters
+    ----------
+    path
+        The directory of the LogFile.
+    """
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.records = np.load(self.path / "records.npy", mmap_mode="r")
+        self._object_index = (
+            np.load(self.path / "object_rows.npy", mmap_mode="r"),
+            np.load(self.path / "object_offsets.npy", mmap_mode="r"),
+        )
+        self._activity_index = (
+            np.load(self.path / "activity_rows.npy", mmap_mode="r"),
+            np.load(self.path / "activity_offsets.npy", mmap_mode="r"),
+        )
+        with open(self.path / "tables.pkl", "rb") as f:
+            tables = pickle.load(f)
+        self.object_ids = tables["object_ids"]
+        self.object_names = tables["object_names"]
+        self.id_table = tables["id_table"]
+        self._snapshots = tables["snapshots"]
+        self._labels = tables["labels"]
+        self._object_codes = {id_: code for code, id_ in enumerate(self.object_ids)}
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def save(cls, path, objects):
+        """
+        Write the logs of the given objects to a LogFile and open it.
+
+        Only openclsim (log_entry_v1) entries are supported.
+
+        Parameters
+        ----------
+        path
+            The directory to write to, it is created if needed.
+        objects
+            The Log objects of which the logs are written.
+        """
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        id_table = IdTable()
+        snapshots, snapshot_index = [], {}
+        labels, label_index = [{}], {(): 0}
+        columns = {name: [] for name in _RECORD_DTYPE.names}
+        for code, obj in enumerate(objects):
+            for entry in obj.logbook:
+                if "Message" in entry:
+                    raise TypeError(
+                        "LogFile only supports openclsim (log_entry_v1) entries"
+                    )
+                state = entry.get("ObjectState", {})
+                if id(state) not in snapshot_index:
+                    snapshot_index[id(state)] = len(snapshots)
+                    snapshots.append(state)
+                label = entry.get("ActivityLabel") or {}
+                try:
+                    key = tuple(label.items())
+                except TypeError:
+                    key = None
+                if key not in label_index:
+                    if key is not None:
+                        label_index[key] = len(labels)
+                    labels.append(dict(label))
+                columns["Timestamp"].append(_to_float_time(entry["Timestamp"]))
+                columns["Object"].append(code)
+                columns["ActivityID"].append(id_table.intern(entry.get("ActivityID")))
+                columns["ActivityState"].append(
+                    LogState[entry.get("ActivityState", LogState.UNKNOWN.name)].value
+                )
+                columns["ObjectState"].append(snapshot_index[id(state)])
+                columns["ActivityLabel"].append(
+                    label_index[key] if key is not None else len(labels) - 1
+                )
+
+        records = np.empty(len(columns["Timestamp"]), dtype=_RECORD_DTYPE)
+        for name, values in columns.items():
+            records[name] = values
+        records = records[np.argsort(records["Timestamp"], kind="stable")]
+
+        np.save(path / "records.npy", records)
+        for name, codes, n_groups in [
+            ("object", records["Object"], len(objects)),
+            ("activity", records["ActivityID"], len(id_table)),
+        ]:
+            rows, offsets = _group_index(codes, n_groups)
+            np.save(path / f"{name}_rows.npy", rows)
+            np.save(path / f"{name}_offsets.npy", offsets)
+        with open(path / "tables.pkl", "wb") as f:
+            pickle.dump(
+                {
+                    "object_ids": [getattr(obj, "id", None) for obj in objects],
+                    "object_names": [getattr(obj, "name", None) for obj in objects],
+                    "id_table": id_table,
+                    "snapshots": snapshots,
+                    "labels": labels,
+                },
+                f,
+            )
+        return cls(path)
+
+    def _group_rows(self, index, code):
+        rows, offsets = index
+        if code is None:
+            return np.empty(0, dtype=int)
+        return np.asarray(rows[offsets[code] : offsets[code + 1]])
+
+    def rows(self, object_id=None, activity_id=None, start=None, stop=None):
+        """
+        Return the (time ordered) row numbers of the entries that match a query.
+
+        Parameters
+        ----------
+        object_id
+            Only the entries of the object with this id.
+        activity_id
+            Only the entries of the activity with this id.
+        start
+            Only the entries at or after this time (float or datetime).
+        stop
+            Only the entries before this time (float or datetime).
+        """
+        timestamps = self.records["Timestamp"]
+        if object_id is None and activity_id is None:
+            lo = (
+                0
+                if start is None
+                else np.searchsorted(timestamps, _to_float_time(start))
+            )
+            hi = (
+                len(self)
+                if stop is None
+                else np.searchsorted(timestamps, _to_float_time(stop))
+            )
+            return np.arange(lo, hi)
+
+        if object_id is not None:
+            rows = self._group_rows(
+                self._object_index, self._object_codes.get(object_id)
+            )
+            if activity_id is not None:
+                code = self.id_table.code(activity_id)
+                rows = rows[np.asarray(self.records["ActivityID"][rows]) == code]
+        else:
+            rows = self._group_rows(
+                self._activity_index, self.id_table.code(activity_id)
+            )
+
+        # the rows of a group are time ordered, so the range is a slice
+        times = np.asarray(timestamps[rows])
+        lo = 0 if start is None else np.searchsorted(times, _to_float_time(start))
+        hi = len(rows) if stop is None else np.searchsorted(times, _to_float_time(stop))
+        return rows[lo:hi]
+
+    def _raw_rows(self, rows):
+        """Return the entries at the given row numbers in (raw) log format."""
+        records = self.records[np.asarray(rows, dtype=int)]
+        return {
+            "Timestamp": records["Timestamp"].tolist(),
+            "ActivityID": self.id_table.decode(records["ActivityID"]).tolist(),
+            "ActivityState": [_STATE_NAMES[s] for s in records["ActivityState"]],
+            "ObjectState": [self._snapshots[i] for i in records["ObjectState"]],
+            "ActivityLabel": [dict(self._labels[i]) for i in records["ActivityLabel"]],
+        }
+
+    def to_dataframe(self, object_id=None, activity_id=None, start=None, stop=None):
+        """
+        Return the entries that match a query as a pandas DataFrame.
+
+        The DataFrame has the columns of the log and the columns ObjectID and
+        ObjectName. See rows for the parameters of the query.
+        """
+        records = self.records[self.rows(object_id, activity_id, start, stop)]
+
+        def lookup(table, references):
+            values = np.empty(len(table), dtype=object)
+            values[:] = table
+            return values[np.asarray(references, dtype=int)]
+
+        return pd.DataFrame(
+            {
+                "ObjectID": lookup(self.object_ids, records["Object"]),
+                "ObjectName": lookup(self.object_names, records["Object"]),
+                "Timestamp": _to_datetime64(records["Timestamp"]),
+                "ActivityID": self.id_table.decode(records["ActivityID"]),
+                "ActivityState": pd.Series(records["ActivityState"])
+                .map(_STATE_NAMES)
+                .to_numpy(),
+                "ObjectState": lookup(self._snapshots, records["ObjectState"]),
+                "ActivityLabel": lookup(self._labels, records["ActivityLabel"]),
+            }
+        )
+
+    def logbook(self, object_id):
+        """Return a read-only FileLogbook with the entries of one object."""
+        return FileLogbook(self, object_id)
+
+
+class FileLogbook(_Logbook):
+    """
+    Read-only logbook with the entries of one object in a LogFile.
+
+    Assign it to a Log object (``obj.logbook = log_file.logbook(obj.id)``)
+    to read back a saved log. Time and activity queries (see Log.query_log)
+    use the indexes of the file.
+
+    Parameters
+    ----------
+    log_file
+        The LogFile with the entries.
+    object_id
+        The id of the object.
+    """
+
+    def __init__(self, log_file, object_id):
+        self.log_file = log_file
+        self.object_id = object_id
+        self.rows = log_file.rows(object_id=object_id)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def append_v1(self, *args, **kwargs):
+        raise TypeError("a FileLogbook is read-only")
+
+    def _raw_format(self, start=0):
+        return self.log_file._raw_rows(self.rows[start:])
+
+    def _records(self, start, stop, step=1):
+        log = self.log_file._raw_rows(self.rows[start:stop:step])
+        return [dict(zip(log, values)) for values in zip(*log.values())]
+
+    def query(self, start=None, stop=None, activity_id=None):
+        """Return the entries in [start, stop) of one activity in log format."""
+        rows = self.log_file.rows(self.object_id, activity_id, start, stop)
+        log = self.log_file._raw_rows(rows)
+        log["Timestamp"] = _to_datetimes(log["Timestamp"])
+        return log
@@ -6,11 +6,12 @@ import warnings
 from typing import Callable, List, Optional
 
 import numpy as np
-import pyproj
 import shapely
 import shapely.geometry
+from shapely.geometry.base import BaseGeometry
 
 from .container import HasContainer, HasMultiContainer
+from .geodesy import WGS84, edge_geometry, geodesic_distance
 from .locatable import Locatable
 from .log import Log, LogState, PerformsActivity
 
@@ -36,9 +37,6 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# we only have one earth, defined here.
-WGS84 = pyproj.Geod(ellps="WGS84")
-
 
 class Movable(Locatable, PerformsActivity, Log):
     """
@@ -107,8 +105,12 @@ class Movable(Locatable, PerformsActivity, Log):
         # Check out the time based on duration of sailing event
         yield self.env.timeout(duration, value=self.activity_id)
 
-        # Set mover geometry to destination geometry
-        self.geometry = shapely.geometry.shape(destination.geometry)
+        # Set mover geometry to destination geometry, shapely geometries are
+        # immutable so the object is shared (and its distances stay cached)
+        geometry = destination.geometry
+        if not isinstance(geometry, BaseGeometry):
+            geometry = shapely.geometry.shape(geometry)
+        self.geometry = geometry
 
         # Log the stop event
         self.log_entry_v1(
@@ -135,6 +137,8 @@ class Movable(Locatable, PerformsActivity, Log):
         """
         Determine the sailing distance based on great circle path from origin to destination.
 
+        The distances are cached per pair of geometries, see geodesy.DistanceCache.
+
         Parameters
         ----------
 
@@ -143,10 +147,7 @@ class Movable(Locatable, PerformsActivity, Log):
         destination: shapely.geometry.Point
             The destination of the move.
         """
-        orig = shapely.geometry.shape(origin)
-        dest = shapely.geometry.shape(destination)
-        _, _, distance = WGS84.inv(orig.x, orig.y, dest.x, dest.y)
-        return distance
+        return geodesic_distance(origin, destination)
 
     def compute_duration(
         self, origin: shapely.Geometry, destination: shapely.Geometry, engine_order=1.0
@@ -154,6 +155,9 @@ class Movable(Locatable, PerformsActivity, Log):
         """
         Determine the duration based on great circle path from origin to destination.
 
+        If the environment has a distance_matrix (see geodesy.DistanceMatrix)
+        that holds both locations, the distance is looked up.
+
         Parameters
         ----------
         origin: shapely.geometry.Point
@@ -164,7 +168,12 @@ class Movable(Locatable, PerformsActivity, Log):
             The engine order to use for the move.
 
         """
-        distance = self.compute_distance(origin, destination)
+        distance = None
+        distance_matrix = getattr(self.env, "distance_matrix", None)
+        if distance_matrix is not None:
+            distance = distance_matrix.distance(origin, destination)
+        if distance is None:
+            distance = self.compute_distance(origin, destination)
         return distance / (self.v * engine_order)
 
 
@@ -219,13 +228,7 @@ class MultiContainerDependentMovable(Movable, HasMultiContainer):
 
     @property
     def v(self):
-        sum_level = 0
-        sum_capacity = 0
-        for id_ in self.container.container_list:
-            sum_level = self.container.get_level(id_)
-            sum_capacity = self.container.get_capacity(id_)
-        fill_degree = sum_level / sum_capacity
-        return self.compute_v(fill_degree)
+        return self.compute_v(self.container.get_fill_degree())
 
 
 class Routable(Movable, Locatable):
@@ -314,9 +317,8 @@ class Routable(Movable, Locatable):
             )
 
             for a, b in zip(self.route[:-1], self.route[1:]):
-                e = (a, b)
-                edge = self.env.graph.edges[e]
-                total_distance += WGS84.geometry_length(edge["geometry"])
+                _, length = edge_geometry(self.env.graph, a, b)
+                total_distance += length
             return total_distance
 
         else:
@@ -338,7 +340,11 @@ class Routable(Movable, Locatable):
         yield self.env.timeout(duration)
         self.geometry = geometry
 
-    def pass_linestring(self, geometry: shapely.geometry.LineString):
+    def pass_linestring(
+        self,
+        geometry: shapely.geometry.LineString,
+        distance: Optional[float] = None,
+    ):
         """
         Pass a linestring, move along the linestring. Duration is computed on the great circle distance.
 
@@ -347,13 +353,16 @@ class Routable(Movable, Locatable):
 
         geometry: shapely.geometry.LineString
             geometry to move over
+        distance: float, optional
+            the geodesic length of the geometry, computed if not given
 
 
         """
         a = shapely.geometry.Point(geometry.coords[0])
         b = shapely.geometry.Point(geometry.coords[-1])
         assert isinstance(geometry, shapely.geometry.LineString)
-        distance = WGS84.geometry_length(geometry)
+        if distance is None:
+            distance = WGS84.geometry_length(geometry)
         duration = distance / (self.v * self.engine_order)
         self.geometry = a
         yield self.env.timeout(duration)
@@ -403,18 +412,17 @@ class Routable(Movable, Locatable):
         for i, (a, b) in enumerate(pairwise(route)):
             a_geometry = self.env.graph.nodes[a]["geometry"]
             b_geometry = self.env.graph.nodes[b]["geometry"]
-            edge_geometry = self.env.graph.edges[(a, b)]["geometry"]
-            # make sure we are in the right order
-            edge_geometry = self.order_geometry(edge_geometry, a_geometry)
+            # the edge geometry starting at a, cached on the graph
+            geometry, distance = edge_geometry(self.env.graph, a, b)
             # go to a (we should already be here)
             self.geometry = a_geometry
             self.node = a
             # pass over the edge
-            yield from self.pass_linestring(edge_geometry)
+            yield from self.pass_linestring(geometry, distance)
             # call any other functions we have registered
             for pass_edge_function in self.on_pass_edge_functions:
                 yield pass_edge_function(
-                    movable=self, a=a, b=b, route=route, geometry=edge_geometry
+                    movable=self, a=a, b=b, route=route, geometry=geometry
                 )
             # we have arrived, go there....
             self.geometry = b_geometry
@@ -425,12 +433,42 @@ class Routable(Movable, Locatable):
         destination: Optional[Locatable] = None,
         duration: Optional[float] = None,
         engine_order: Optional[float] = None,
+        route: Optional[List[str]] = None,
     ):
+        """
+        Sail over the path or the route.
+
+        Without a path or a route, the shortest route to the destination is
+        asked from the routing service of the environment (env.routing, see
+        routing.RoutingService), if there is one.
+
+        Parameters
+        ----------
+        destination: Locatable, optional
+            The destination of the move, used for routing.
+        duration: float, optional
+            Not used, the duration follows from the path or route.
+        engine_order: float, optional
+            The engine order to use for the move.
+        route: list, optional
+            A list of nodes to sail over in this move instead of self.path or
+            self.route.
+        """
         if engine_order is not None:
             self.engine_order = engine_order
 
-        if self.path:
-            for event in self.pass_linestring(self.path):
+        # an explicit route takes precedence over the path
+        path = self.path if route is None else None
+        if route is None:
+            route = self.route
+        routing = getattr(self.env, "routing", None)
+        if not path and not route and routing is not None:
+            if destination is None:
+                raise ValueError("Routing requires a destination")
+            route = routing.route(self, destination)
+
+        if path:
+            for event in self.pass_linestring(path):
                 self.log_entry_v1(
                     self.env.now,
                     self.activity_id,
@@ -442,8 +480,8 @@ class Routable(Movable, Locatable):
                     self.activity_id,
                     LogState.STOP,
                 )
-        elif self.route:
-            for event in self.move_over_route(self.route):
+        elif route:
+            for event in self.move_over_route(route):
                 self.log_entry_v1(
                     self.env.now,
                     self.activity_id,
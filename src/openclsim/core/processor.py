@@ -33,12 +33,23 @@ class Processor(SimpyObject):
         shiftamount_fcn,
         reserved_amount,
         id_="default",
+        claims=None,
     ):
         """
         Move content from ship to the site or from the site to the ship.
 
         This to ensure that the ship's container reaches the desired level.
         Yields the time it takes to process.
+
+        id_ can also be a list of container ids to move several commodities
+        in one step. shiftamount_fcn then returns the duration and a list of
+        amounts, and reserved_amount is a list, both in the order of id_. The
+        amounts are taken from and put in all containers at once, with one
+        timeout and one pair of log entries.
+
+        claims is an optional dict with the ContainerClaim of the origin
+        content ("get") and of the destination space ("put"). Each claim is
+        released as soon as its amount has been shifted.
         """
 
         assert isinstance(origin, HasContainer)
@@ -69,6 +80,7 @@ class Processor(SimpyObject):
             activity="get",
             reserved_amount=reserved_amount,
             id_=id_,
+            claim=(claims or {}).get("get"),
         )
         yield self.env.timeout(duration, value=self.activity_id)
         # Put the amount in the destination
@@ -79,6 +91,7 @@ class Processor(SimpyObject):
             activity="put",
             reserved_amount=reserved_amount,
             id_=id_,
+            claim=(claims or {}).get("put"),
         )
 
         # Log the process for all parts
@@ -90,7 +103,14 @@ class Processor(SimpyObject):
             )
 
     def check_possible_shift(
-        self, origin, destination, amount, activity, reserved_amount, id_="default"
+        self,
+        origin,
+        destination,
+        amount,
+        activity,
+        reserved_amount,
+        id_="default",
+        claim=None,
     ):
         """
         Check if all the material is available.
@@ -101,19 +121,28 @@ class Processor(SimpyObject):
         """
         obj_map = {"get": origin, "put": destination}
         obj = obj_map[activity]
-        method = getattr(obj.container, activity)
+
+        reserve = getattr(obj.container, f"{activity}_reservation")
 
         start_time = self.env.now
-        # Shift amounts in containers
-        yield method(
-            amount,
-            id_,
-        )
-        # Correct the container reservation with the actual amount
-        yield method(
-            amount - reserved_amount,
-            f"{id_}_reservations",
-        )
+        if isinstance(id_, (list, tuple)):
+            # Shift the amounts of all containers at once
+            method = getattr(obj.container, f"{activity}_many")
+            yield method(dict(zip(id_, amount)))
+            for container, shifted, reserved in zip(id_, amount, reserved_amount):
+                reserve(shifted - reserved, container)
+        else:
+            method = getattr(obj.container, activity)
+            # Shift amounts in containers
+            yield method(
+                amount,
+                id_,
+            )
+            # Correct the container reservation with the actual amount
+            reserve(amount - reserved_amount, id_)
+        if claim is not None:
+            # the claimed amount has been handed over
+            obj.container.release_claim(claim)
         end_time = self.env.now
 
         # If the amount is not available in the origin, log waiting
@@ -0,0 +1,141 @@
+"""Shortest path routing over the graph of the environment."""
+
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+import shapely
+import shapely.geometry
+from shapely.geometry.base import BaseGeometry
+
+from .geodesy import edge_geometry, geodesic_distance, geodesic_distances
+
+
+class RoutingService:
+    """
+    Shortest path routing over a graph, with an LRU cache of the routes.
+
+    The edges are weighted by their geodesic length, which is cached on the
+    graph (see geodesy.cache_edge_geometries). Assign the service to the
+    environment (``env.routing = RoutingService(env.graph)``) to have a
+    Routable without a route or path sail the shortest route to its
+    destination, or to use MoveActivity(..., use_routing=True).
+
+    Parameters
+    ----------
+    graph
+        networkx graph with a geometry on all nodes and edges.
+    algorithm
+        "dijkstra", or "astar" to use the geodesic distance to the
+        destination node as heuristic.
+    maxsize
+        Maximum number of cached routes, the least recently used route is
+        evicted beyond that.
+    """
+
+    def __init__(self, graph, algorithm: str = "dijkstra", maxsize: int = 10_000):
+        if algorithm not in ("dijkstra", "astar"):
+            raise ValueError(f"Unknown routing algorithm {algorithm}")
+        self.graph = graph
+        self.algorithm = algorithm
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._routes = OrderedDict()
+
+        self._nodes = list(graph.nodes)
+        self._node_geometries = np.array(
+            [graph.nodes[node]["geometry"] for node in self._nodes], dtype=object
+        )
+
+    def __len__(self):
+        return len(self._routes)
+
+    def _weight(self, a, b, data):
+        _, length = edge_geometry(self.graph, a, b)
+        return length
+
+    def _heuristic(self, a, b):
+        return geodesic_distance(
+            self.graph.nodes[a]["geometry"], self.graph.nodes[b]["geometry"]
+        )
+
+    def nearest_node(self, geometry):
+        """Return the node of the graph nearest to a point geometry."""
+        if not isinstance(geometry, BaseGeometry):
+            geometry = shapely.geometry.shape(geometry)
+        distances = geodesic_distances(
+            shapely.centroid(geometry), self._node_geometries
+        )
+        return self._nodes[int(np.argmin(distances))]
+
+    def node_of(self, locatable):
+        """Return the node of a locatable, its own node if it is on the graph."""
+        node = getattr(locatable, "node", None)
+        if node is not None and node in self.graph:
+            return node
+        return self.nearest_node(locatable.geometry)
+
+    def shortest_path(self, origin, destination):
+        """
+        Return the shortest route from node origin to node destination.
+
+        Parameters
+        ----------
+        origin
+            Node the route starts at.
+        destination
+            Node the route ends at.
+        """
+        key = (origin, destination)
+        route = self._routes.get(key)
+        if route is not None:
+            self.hits += 1
+            self._routes.move_to_end(key)
+            return list(route)
+
+        self.misses += 1
+        if self.algorithm == "astar":
+            route = nx.astar_path(
+                self.graph,
+                origin,
+                destination,
+                heuristic=self._heuristic,
+                weight=self._weight,
+            )
+        else:
+            route = nx.dijkstra_path(
+                self.graph, origin, destination, weight=self._weight
+            )
+        self._routes[key] = tuple(route)
+        if len(self._routes) > self.maxsize:
+            self._routes.popitem(last=False)
+        return route
+
+    def route(self, origin, destination):
+        """
+        Return the shortest route between two locatable objects.
+
+        The route runs between the nodes of the objects, or the nodes nearest
+        to them if they are not located on the graph.
+
+        Parameters
+        ----------
+        origin
+            Locatable object the route starts at.
+        destination
+            Locatable object the route ends at.
+        """
+        return self.shortest_path(self.node_of(origin), self.node_of(destination))
+
+    def route_length(self, route):
+        """Return the geodesic length in meters of a route."""
+        return sum(
+            edge_geometry(self.graph, a, b)[1] for a, b in zip(route[:-1], route[1:])
+        )
+
+    def clear(self):
+        """Remove all cached routes and reset the counters."""
+        self._routes.clear()
+        self.hits = 0
+        self.misses = 0
@@ -12,5 +12,6 @@ class SimpyObject:
     """
 
     def __init__(self, env, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        # set before the other mixins initialize, so they can use the env
         self.env = env
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,192 @@
+"""Spatial index over the locatable objects of a simulation."""
+
+import math
+
+import numpy as np
+import shapely
+import shapely.geometry
+from shapely.geometry.base import BaseGeometry
+
+from .geodesy import geodesic_distances
+
+# length of a degree of latitude and of longitude at the equator, used to
+# convert a radius in meters to a bounding box in degrees
+_METERS_PER_DEGREE_LAT = 110_574.0
+_METERS_PER_DEGREE_LON = 111_319.0
+# the box is widened by this factor, so it certainly contains the radius
+_BOX_MARGIN = 1.1
+
+
+class SpatialIndex:
+    """
+    Spatial index over Locatable objects, built on shapely.STRtree.
+
+    The tree prefilters candidates on their bounding box in degrees, the
+    candidates are refined with the geodesic distance between the centroids.
+    Assign the index to the environment before the objects are created
+    (``env.spatial_index = SpatialIndex()``) to have every Locatable register
+    itself.
+
+    The STRtree can not be changed after it is built. Objects that are added
+    or that change their geometry after the build are kept aside and
+    checked one by one, until their number exceeds rebuild_fraction of the
+    indexed objects and the tree is rebuilt at the next query.
+
+    Parameters
+    ----------
+    locatables
+        Locatable objects to index.
+    rebuild_fraction
+        Fraction of moved or added objects that triggers a rebuild of the tree.
+    """
+
+    def __init__(self, locatables=(), rebuild_fraction: float = 0.1):
+        self.rebuild_fraction = rebuild_fraction
+        self._objects = {}
+        self._tree = None
+        self._tree_objects = []
+        self._pending = {}
+        for locatable in locatables:
+            self.add(locatable)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, locatable):
+        return id(locatable) in self._objects
+
+    def add(self, locatable):
+        """Add a locatable object to the index."""
+        self._objects[id(locatable)] = locatable
+        self._pending[id(locatable)] = locatable
+
+    def remove(self, locatable):
+        """Remove a locatable object from the index."""
+        del self._objects[id(locatable)]
+        self._pending.pop(id(locatable), None)
+        self._tree = None
+
+    def update(self, locatable):
+        """Tell the index that the geometry of locatable has changed."""
+        if id(locatable) in self._objects:
+            self._pending[id(locatable)] = locatable
+
+    def rebuild(self):
+        """Build the tree over the current geometry of all objects."""
+        self._tree_objects = list(self._objects.values())
+        self._tree = shapely.STRtree(
+            [locatable.geometry for locatable in self._tree_objects]
+        )
+        self._pending = {}
+
+    def _ensure_tree(self):
+        if self._tree is None or len(self._pending) > self.rebuild_fraction * len(
+            self._objects
+        ):
+            self.rebuild()
+
+    def _candidates(self, box):
+        """Return the objects of which the geometry may intersect box."""
+        self._ensure_tree()
+        candidates = [
+            self._tree_objects[i]
+            for i in self._tree.query(box).tolist()
+            if id(self._tree_objects[i]) not in self._pending
+        ]
+        candidates.extend(
+            locatable
+            for locatable in self._pending.values()
+            if locatable.geometry.intersects(box)
+        )
+        return candidates
+
+    @staticmethod
+    def _search_box(point, radius):
+        """Return a lon, lat box that contains all points within radius of point."""
+        radius = radius * _BOX_MARGIN
+        dy = radius / _METERS_PER_DEGREE_LAT
+        max_lat = min(abs(point.y) + dy, 90.0)
+        cos_lat = math.cos(math.radians(max_lat))
+        if max_lat >= 89.0 or radius >= _METERS_PER_DEGREE_LON * 90 * cos_lat:
+            dx = 360.0
+        else:
+            dx = radius / (_METERS_PER_DEGREE_LON * cos_lat)
+        if point.x - dx < -180.0 or point.x + dx > 180.0:
+            # the box wraps the antimeridian, search all longitudes
+            return shapely.box(-180.0, point.y - dy, 180.0, point.y + dy)
+        return shapely.box(point.x - dx, point.y - dy, point.x + dx, point.y + dy)
+
+    @staticmethod
+    def _query_point(location):
+        geometry = getattr(location, "geometry", location)
+        if not isinstance(geometry, BaseGeometry):
+            geometry = shapely.geometry.shape(geometry)
+        return shapely.centroid(geometry)
+
+    def _refine(self, location, candidates, radius):
+        point = self._query_point(location)
+        candidates = [
+            candidate for candidate in candidates if candidate is not location
+        ]
+        if not candidates:
+            return [], np.empty(0)
+        centroids = shapely.centroid([candidate.geometry for candidate in candidates])
+        distances = geodesic_distances(point, centroids)
+        order = np.argsort(distances, kind="stable")
+        order = order[distances[order] <= radius]
+        return [candidates[i] for i in order.tolist()], distances[order]
+
+    def within(self, location, radius, return_distance=False):
+        """
+        Return the objects within radius meters of location, nearest first.
+
+        Parameters
+        ----------
+        location
+            Locatable object (which is left out of the result) or shapely geometry.
+        radius
+            Maximum geodesic distance in meters.
+        return_distance
+            Also return the array of distances in meters.
+        """
+        point = self._query_point(location)
+        candidates = self._candidates(self._search_box(point, radius))
+        objects, distances = self._refine(location, candidates, radius)
+        if return_distance:
+            return objects, distances
+        return objects
+
+    def nearest(self, location, k=1, return_distance=False):
+        """
+        Return the k objects nearest to location, nearest first.
+
+        The search radius is doubled until k candidates are found. All objects
+        within the geodesic distance of the k-th candidate are then compared,
+        so the result does not depend on the planar prefilter.
+
+        Parameters
+        ----------
+        location
+            Locatable object (which is left out of the result) or shapely geometry.
+        k
+            Number of objects to return.
+        return_distance
+            Also return the array of distances in meters.
+        """
+        point = self._query_point(location)
+        available = len(self._objects) - (location in self)
+        k = min(k, available)
+        if k <= 0:
+            return ([], np.empty(0)) if return_distance else []
+
+        radius = 1_000.0
+        while True:
+            candidates = self._candidates(self._search_box(point, radius))
+            objects, distances = self._refine(location, candidates, math.inf)
+            if len(objects) >= k:
+                break
+            radius *= 2
+        objects, distances = self.within(location, distances[k - 1], True)
+        if return_distance:
+            return objects[:k], distances[:k]
+        return objects[:k]
@@ -0,0 +1,87 @@
+"""Compiled state providers used to snapshot the state of simulation objects."""
+
+import weakref
+
+# returned by a state field getter to leave the field out of the state
+OMIT = object()
+
+_compiled_fields = weakref.WeakKeyDictionary()
+_chained_methods = weakref.WeakKeyDictionary()
+# ids of the objects of which a chained get_state method is running
+_chaining = set()
+
+
+def get_state_fields(cls):
+    """
+    Return the flat list of (key, getter) state fields of a class.
+
+    The mixins that contribute to the state of an object declare their fields
+    in a ``state_fields`` class attribute, a tuple of (key, getter) pairs where
+    getter is called with the object. The fields of all classes in the MRO are
+    resolved once per class, base classes first. A field declared again by a
+    subclass keeps its position but uses the getter of the subclass.
+
+    Parameters
+    ----------
+    cls
+        The (composed) class of the simulation object.
+    """
+    fields = _compiled_fields.get(cls)
+    if fields is None:
+        resolved = {}
+        for klass in reversed(cls.__mro__):
+            for key, getter in klass.__dict__.get("state_fields", ()):
+                resolved[key] = getter
+        fields = tuple(resolved.items())
+        _compiled_fields[cls] = fields
+    return fields
+
+
+def _chained_method(cls):
+    """
+    Return the get_state method that is overridden after get_state in the MRO.
+
+    Mixins can still define get_state themselves, updating the result of
+    super().get_state(). Such a method before the first mixin that uses
+    get_state in the MRO calls it through super(). The first one after it
+    is returned here, to be called by get_state.
+    """
+    if cls not in _chained_methods:
+        method = None
+        found = False
+        for klass in cls.__mro__:
+            candidate = klass.__dict__.get("get_state")
+            if candidate is None:
+                continue
+            if candidate is get_state:
+                found = True
+            elif found:
+                method = candidate
+                break
+        _chained_methods[cls] = method
+    return _chained_methods[cls]
+
+
+def get_state(obj):
+    """
+    Return a snapshot of the state of obj as a dict.
+
+    Used as the get_state method of the mixins with a state. Objects that
+    need more than the declared fields can override get_state and update the
+    result of super().get_state(), wherever the mixin is in the MRO.
+    """
+    method = _chained_method(type(obj))
+    if method is not None and id(obj) not in _chaining:
+        # the method calls get_state again through super()
+        _chaining.add(id(obj))
+        try:
+            return method(obj)
+        finally:
+            _chaining.discard(id(obj))
+
+    state = {}
+    for key, getter in get_state_fields(type(obj)):
+        value = getter(obj)
+        if value is not OMIT:
+            state[key] = value
+    return state
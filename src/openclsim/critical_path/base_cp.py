@@ -12,7 +12,7 @@ import plotly.graph_objs as go
 
 from openclsim.critical_path.simulation_graph import SimulationGraph
 from openclsim.model import get_subprocesses
-from openclsim.plot.log_dataframe import get_log_dataframe
+from openclsim.plot.log_dataframe import _map_ids, get_log_dataframe
 from openclsim.plot.vessel_planning import add_layout_gantt_chart, get_colors
 
 
@@ -105,16 +105,23 @@ class BaseCP(ABC):
         if not len(names) == len(set(names)):
             raise ValueError("Names of your objects must be unique!")
 
-        # concat logs with name and keep only columns needed
-        log_list = [get_log_dataframe(obj) for obj in self.object_list]
-        names_column = (
-            pd.Series(names, name="SimulationObject")
-            .repeat([len(df) for df in log_list])
-            .reset_index(drop=True)
-        )
-        log_all = pd.concat(
-            [names_column, pd.concat(log_list).reset_index(drop=True)], axis=1
-        )
+        event_table = getattr(self.env, "event_table", None)
+        if event_table is not None:
+            # all logs are in one table already
+            log_all = event_table.to_dataframe(objects=self.object_list).rename(
+                columns={"ObjectName": "SimulationObject", "ActivityID": "Activity"}
+            )
+        else:
+            # concat logs with name and keep only columns needed
+            log_list = [get_log_dataframe(obj) for obj in self.object_list]
+            names_column = (
+                pd.Series(names, name="SimulationObject")
+                .repeat([len(df) for df in log_list])
+                .reset_index(drop=True)
+            )
+            log_all = pd.concat(
+                [names_column, pd.concat(log_list).reset_index(drop=True)], axis=1
+            )
         log_all = log_all[
             ["Activity", "Timestamp", "ActivityState", "SimulationObject"]
         ]
@@ -123,7 +130,7 @@ class BaseCP(ABC):
         list_all_activities = get_subprocesses(self.activity_list)
         id_map = {act.id: act.name for act in list_all_activities}
         log_all["ActivityID"] = log_all["Activity"]
-        log_all["Activity"] = log_all["Activity"].replace(id_map)
+        log_all["Activity"] = _map_ids(log_all["Activity"], id_map)
 
         return log_all.sort_values("Timestamp").reset_index(drop=True)
 
@@ -75,8 +75,13 @@ class PluginActivity(core.Identifiable, core.Log):
     The plugin mechanism foresees that the plugin function pre_process is called before
     the activity is executed, while the function post_process is called after the
     activity has been executed.
+
+    The amount of logging of an activity can be set with the log_level
+    argument (a core.LogLevel), see core.Log.
     """
 
+    is_activity_log = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.plugins = list()
@@ -232,7 +237,11 @@ class GenericActivity(PluginActivity):
         env,
     ):
         """Return a generator which can be added as a process to a simpy environment."""
-        additional_logs = getattr(self, "additional_logs", [])
+        additional_logs = (
+            getattr(self, "additional_logs", [])
+            if self.log_level is core.LogLevel.FULL
+            else []
+        )
         start_event = (
             None
             if self.start_event is None
@@ -36,6 +36,14 @@ class BasicActivity(GenericActivity):
             additional_logs = []
         self.additional_logs = additional_logs
 
+    def _log_additional(self):
+        """Return True if the additional logs should be written."""
+        return (
+            isinstance(self.additional_logs, list)
+            and len(self.additional_logs) > 0
+            and self.log_level is core.LogLevel.FULL
+        )
+
     def main_process_function(self, activity_log, env):
         """
         Return a generator which can be added as a process to a simpy.Environment.
@@ -79,7 +87,7 @@ class BasicActivity(GenericActivity):
             activity_state=core.LogState.START,
         )
 
-        if isinstance(self.additional_logs, list) and len(self.additional_logs) > 0:
+        if self._log_additional():
             for log_item in self.additional_logs:
                 log_item.log_entry_v1(
                     t=env.now,
@@ -96,7 +104,7 @@ class BasicActivity(GenericActivity):
         activity_log.log_entry_v1(
             t=env.now, activity_id=activity_log.id, activity_state=core.LogState.STOP
         )
-        if isinstance(self.additional_logs, list) and len(self.additional_logs) > 0:
+        if self._log_additional():
             for log_item in self.additional_logs:
                 log_item.log_entry_v1(
                     t=env.now,
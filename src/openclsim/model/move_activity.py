@@ -36,6 +36,10 @@ class MoveActivity(GenericActivity):
     start_event
         the activity will start as soon as this event is processed
         by default will be to start immediately
+    use_routing
+        sail the mover (a core.Routable) over the shortest route from its
+        current node to the destination, asked from the routing service of
+        the environment (env.routing, see core.RoutingService)
     """
 
     def __init__(
@@ -45,8 +49,9 @@ class MoveActivity(GenericActivity):
         duration=None,
         show=False,
         engine_order=1,
+        use_routing=False,
         *args,
-        **kwargs
+        **kwargs,
     ):
         super().__init__(*args, **kwargs)
         """Initialization"""
@@ -55,6 +60,17 @@ class MoveActivity(GenericActivity):
         self.duration = duration
         self.print = show
         self.engine_order = engine_order
+        self.use_routing = use_routing
+        if use_routing:
+            if not isinstance(mover, core.movable.Routable):
+                raise ValueError(
+                    f"use_routing requires a Routable mover, {mover} is not Routable"
+                )
+            if getattr(self.env, "routing", None) is None:
+                raise ValueError(
+                    "use_routing requires a routing service on the environment "
+                    "(env.routing = core.RoutingService(env.graph))"
+                )
 
     def main_process_function(self, activity_log, env):
         """
@@ -100,10 +116,14 @@ class MoveActivity(GenericActivity):
 
         start_mover = env.now
         self.mover.activity_id = activity_log.id
+        move_kwargs = {}
+        if self.use_routing:
+            move_kwargs["route"] = env.routing.route(self.mover, self.destination)
         yield from self.mover.move(
             destination=self.destination,
             engine_order=self.engine_order,
             duration=self.duration,
+            **move_kwargs,
         )
 
         activity_log.log_entry_v1(
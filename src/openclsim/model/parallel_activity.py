@@ -52,12 +52,13 @@ class ParallelActivity(GenericActivity, RegisterSubProcesses):
         stop_events = []
         subprocess_ids = []
         for sub_process in self.sub_processes:
-            activity_log.log_entry_v1(
-                t=env.now,
-                activity_id=activity_log.id,
-                activity_state=core.LogState.START,
-                activity_label={"type": "subprocess", "ref": sub_process.id},
-            )
+            if self.log_level is core.LogLevel.FULL:
+                activity_log.log_entry_v1(
+                    t=env.now,
+                    activity_id=activity_log.id,
+                    activity_state=core.LogState.START,
+                    activity_label={"type": "subprocess", "ref": sub_process.id},
+                )
 
             stop_events.append(
                 {"type": "activity", "state": "done", "name": sub_process.name}
@@ -76,15 +77,17 @@ class ParallelActivity(GenericActivity, RegisterSubProcesses):
             while i < len(stop_events):
                 if self.parse_expression(stop_events[i]).triggered is True:
                     stop_events.pop(i)
-                    activity_log.log_entry_v1(
-                        t=env.now,
-                        activity_id=activity_log.id,
-                        activity_state=core.LogState.STOP,
-                        activity_label={
-                            "type": "subprocess",
-                            "ref": subprocess_ids.pop(i),
-                        },
-                    )
+                    subprocess_id = subprocess_ids.pop(i)
+                    if self.log_level is core.LogLevel.FULL:
+                        activity_log.log_entry_v1(
+                            t=env.now,
+                            activity_id=activity_log.id,
+                            activity_state=core.LogState.STOP,
+                            activity_label={
+                                "type": "subprocess",
+                                "ref": subprocess_id,
+                            },
+                        )
                 else:
                     i += 1
 
@@ -50,15 +50,16 @@ class SequentialActivity(GenericActivity, RegisterSubProcesses):
         self.start_sequence.succeed()
 
         for sub_process in self.sub_processes:
-            activity_log.log_entry_v1(
-                t=env.now,
-                activity_id=activity_log.id,
-                activity_state=core.LogState.START,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": sub_process.id,
-                },
-            )
+            if self.log_level is core.LogLevel.FULL:
+                activity_log.log_entry_v1(
+                    t=env.now,
+                    activity_id=activity_log.id,
+                    activity_state=core.LogState.START,
+                    activity_label={
+                        "type": "subprocess",
+                        "ref": sub_process.id,
+                    },
+                )
 
             stop_event = self.parse_expression(
                 [
@@ -71,15 +72,16 @@ class SequentialActivity(GenericActivity, RegisterSubProcesses):
             )
             yield stop_event
 
-            activity_log.log_entry_v1(
-                t=env.now,
-                activity_id=activity_log.id,
-                activity_state=core.LogState.STOP,
-                activity_label={
-                    "type": "subprocess",
-                    "ref": sub_process.id,
-                },
-            )
+            if self.log_level is core.LogLevel.FULL:
+                activity_log.log_entry_v1(
+                    t=env.now,
+                    activity_id=activity_log.id,
+                    activity_state=core.LogState.STOP,
+                    activity_label={
+                        "type": "subprocess",
+                        "ref": sub_process.id,
+                    },
+                )
 
         activity_log.log_entry_v1(
             t=env.now,
@@ -35,6 +35,15 @@ class ShiftAmountActivity(GenericActivity):
     id_
         in case of MultiContainers the id_ of the container, where the objects should
         be removed from or assiged to respectively.
+    wait_queue
+        If True, wait in the FIFO queues of the origin content and destination
+        space (see EventsContainer.claim_content) instead of on level events.
+        Only the activities that the new level can serve are woken, and the
+        claimed amount is kept for this activity until it has been shifted.
+        If less than the amount is left for this activity when it is at the
+        head of a queue, the amount that is left is shifted.
+    queue_priority
+        Priority in the wait queues (lowest first), by default 0.
     start_event
         the activity will start as soon as this event is processed
         by default will be to start immediately
@@ -50,6 +59,8 @@ class ShiftAmountActivity(GenericActivity):
         id_="default",
         show=False,
         phase=None,
+        wait_queue=False,
+        queue_priority=0,
         *args,
         **kwargs,
     ):
@@ -64,6 +75,9 @@ class ShiftAmountActivity(GenericActivity):
         self.id_ = id_
         self.print = show
         self.phase = phase
+        self.wait_queue = wait_queue
+        self.queue_priority = queue_priority
+        self.claims = None
 
     def main_process_function(self, activity_log, env):
         """Origin and Destination are of type HasContainer."""
@@ -92,21 +106,48 @@ class ShiftAmountActivity(GenericActivity):
             )
 
             # yield until enough content and space available in origin and destination
-            yield env.all_of(
-                events=[
-                    self.origin.container.get_container_event(
-                        level=amount,
-                        operator="ge",
-                        id_=self.id_,
-                    ),
-                    self.destination.container.get_container_event(
-                        level=self.destination.container.get_capacity(self.id_)
-                        - amount,
-                        operator="le",
-                        id_=self.id_,
-                    ),
-                ]
-            )
+            if self.wait_queue:
+                if self.claims is None:
+                    # partial claims, the amount is reduced to what is left
+                    # when the claims of others are granted first
+                    self.claims = {
+                        "get": self.origin.container.claim_content(
+                            amount, self.id_, self.queue_priority, partial=True
+                        ),
+                        "put": self.destination.container.claim_space(
+                            amount, self.id_, self.queue_priority, partial=True
+                        ),
+                    }
+                else:
+                    # retry, keep the place of the claims in the queues
+                    self.claims = {
+                        "get": self.origin.container.requeue_claim(
+                            self.claims["get"], amount
+                        ),
+                        "put": self.destination.container.requeue_claim(
+                            self.claims["put"], amount
+                        ),
+                    }
+                yield env.all_of(events=list(self.claims.values()))
+                amount = min(claim.amount for claim in self.claims.values())
+                self.origin.container.reduce_claim(self.claims["get"], amount)
+                self.destination.container.reduce_claim(self.claims["put"], amount)
+            else:
+                yield env.all_of(
+                    events=[
+                        self.origin.container.get_container_event(
+                            level=amount,
+                            operator="ge",
+                            id_=self.id_,
+                        ),
+                        self.destination.container.get_container_event(
+                            level=self.destination.container.get_capacity(self.id_)
+                            - amount,
+                            operator="le",
+                            id_=self.id_,
+                        ),
+                    ]
+                )
 
             yield from self._request_resource(
                 self.requested_resources, self.processor.resource
@@ -196,7 +237,9 @@ class ShiftAmountActivity(GenericActivity):
             shiftamount_fcn=shiftamount_fcn,
             reserved_amount=self.reserved_amount,
             id_=self.id_,
+            claims=self.claims,
         )
+        self.claims = None
 
     def _get_shiftamount_fcn(self, amount):
         if self.duration is not None:
@@ -216,11 +259,11 @@ class ShiftAmountActivity(GenericActivity):
             self.origin, self.destination, amount=self.amount, id_=self.id_
         )
 
-        self.destination.container.put(
+        self.destination.container.put_reservation(
             amount=self.reserved_amount,
-            id_=f"{self.id_}_reservations",
+            id_=self.id_,
         )
-        self.origin.container.get(
+        self.origin.container.get_reservation(
             amount=self.reserved_amount,
-            id_=f"{self.id_}_reservations",
+            id_=self.id_,
         )
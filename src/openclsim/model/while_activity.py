@@ -31,15 +31,16 @@ class ConditionProcessMixin:
         while True:
             self.start_sequence.succeed()
             for sub_process in self.sub_processes:
-                activity_log.log_entry_v1(
-                    t=env.now,
-                    activity_id=activity_log.id,
-                    activity_state=core.LogState.START,
-                    activity_label={
-                        "type": "subprocess",
-                        "ref": sub_process.id,
-                    },
-                )
+                if self.log_level is core.LogLevel.FULL:
+                    activity_log.log_entry_v1(
+                        t=env.now,
+                        activity_id=activity_log.id,
+                        activity_state=core.LogState.START,
+                        activity_label={
+                            "type": "subprocess",
+                            "ref": sub_process.id,
+                        },
+                    )
 
                 stop_event = self.parse_expression(
                     [
@@ -52,15 +53,16 @@ class ConditionProcessMixin:
                 )
                 yield stop_event
 
-                activity_log.log_entry_v1(
-                    t=env.now,
-                    activity_id=activity_log.id,
-                    activity_state=core.LogState.STOP,
-                    activity_label={
-                        "type": "subprocess",
-                        "ref": sub_process.id,
-                    },
-                )
+                if self.log_level is core.LogLevel.FULL:
+                    activity_log.log_entry_v1(
+                        t=env.now,
+                        activity_id=activity_log.id,
+                        activity_state=core.LogState.STOP,
+                        activity_label={
+                            "type": "subprocess",
+                            "ref": sub_process.id,
+                        },
+                    )
 
             # We check both the static and reactive event. If a event is processed
             # and after that defused the event is overwritten and not longer reactive.
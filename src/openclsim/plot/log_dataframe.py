@@ -1,11 +1,25 @@
 """Get the log of the simulation objects in a pandas dataframe."""
 
+import numpy as np
 import pandas as pd
 
 from openclsim.model import get_subprocesses
 
 
-def get_log_dataframe(simulation_object, id_map=None):
+def _map_ids(ids, id_map):
+    """Resolve the ids in a Series with id_map, looking up each unique id once."""
+    if not id_map:
+        return ids
+    codes, uniques = pd.factorize(ids)
+    resolved = np.empty(len(uniques) + 1, dtype=object)
+    resolved[:-1] = [id_map.get(id_, id_) for id_ in uniques]
+    resolved[-1] = np.nan
+    return pd.Series(resolved[codes], index=ids.index, name=ids.name)
+
+
+def get_log_dataframe(
+    simulation_object, id_map=None, start=None, stop=None, activity_id=None
+):
     """Get the chronological log of one simulation object in a pandas dataframe.
 
     result is sorted by Timestamp
@@ -19,6 +33,9 @@ def get_log_dataframe(simulation_object, id_map=None):
         * a list or dict of top-activities of which also all sub-activities
           will be resolved, e.g.: [while_activity]
         * a manual id_map to resolve uuids to labels, e.g. {'uuid1':'name1'}
+    start, stop, activity_id
+        only return the entries in [start, stop) of this activity, see
+        Log.query_log. Objects with a FileLogbook read only these entries.
     """
     if id_map is None:
         id_map = []
@@ -31,21 +48,24 @@ def get_log_dataframe(simulation_object, id_map=None):
     else:
         id_map = id_map if id_map else {}
 
-    df = (
-        pd.DataFrame(simulation_object.log)
-        .sort_values(by=["Timestamp"])
-        .sort_values(by=["Timestamp"])
+    if start is None and stop is None and activity_id is None:
+        log = simulation_object.log
+    else:
+        log = simulation_object.query_log(
+            start=start, stop=stop, activity_id=activity_id
+        )
+    df = pd.DataFrame(log).sort_values(by=["Timestamp"])
+    activity = df.filter(items=["ActivityID"]).rename(
+        columns={"ActivityID": "Activity"}
     )
+    if "Activity" in activity:
+        activity["Activity"] = _map_ids(activity["Activity"], id_map)
     return pd.concat(
         [
-            (
-                df.filter(items=["ActivityID"])
-                .rename(columns={"ActivityID": "Activity"})
-                .replace(id_map)
-            ),
-            pd.DataFrame(simulation_object.log).filter(["Timestamp", "ActivityState"]),
-            pd.DataFrame(simulation_object.log["ObjectState"]),
-            pd.DataFrame(simulation_object.log["ActivityLabel"]),
+            activity,
+            pd.DataFrame(log).filter(["Timestamp", "ActivityState"]),
+            pd.DataFrame(log["ObjectState"]),
+            pd.DataFrame(log["ActivityLabel"]),
         ],
         axis=1,
     )
@@ -2,12 +2,18 @@
 
 import matplotlib.pyplot as plt
 
+from openclsim.core.log import _to_datetime64
+
 from .log_dataframe import get_log_dataframe
 
 
 def get_step_chart(simulation_objects, container_map=None):
     """Get the step chart of the container levels.
 
+    The levels are read from the level series that the containers record
+    (see EventsContainer.get_level_series), or from the log of the objects
+    if the container does not record them.
+
     Parameters
     ----------
     simulation_objects
@@ -22,8 +28,20 @@ def get_step_chart(simulation_objects, container_map=None):
 
     fig = plt.figure(figsize=(14, 7))
     for obj in simulation_objects:
-        df = get_log_dataframe(obj)
         container_list = obj.container.container_list
+        if getattr(obj.container, "record_levels", False):
+            # use the level series recorded by the container
+            for container in container_list:
+                times, levels = obj.container.get_level_series(container)
+                plt.step(
+                    _to_datetime64(times),
+                    levels,
+                    where="post",
+                    label=f"{obj.name} {container_map.get(container,container)}",
+                )
+            continue
+
+        df = get_log_dataframe(obj)
         for container in container_list:
             if hasattr(df, "container level"):
                 if isinstance(list(df["container level"])[0], dict) is False:
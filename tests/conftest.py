@@ -85,6 +85,23 @@ def simulation_4_barges():
     return demo_data(nr_barges=4, total_amount=100)
 
 
+class EventTableEnvironment(simpy.Environment):
+    """simpy.Environment that stores the logs of all objects in one core.EventTable."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event_table = core.EventTable()
+
+
+@pytest.fixture()
+def simulation_4_barges_event_table():
+    """
+    Fixture returns the environment, objects and activities after a 4-barges simulation,
+    with the logs of all objects stored in a shared event table.
+    """
+    return demo_data(nr_barges=4, total_amount=100, env=EventTableEnvironment)
+
+
 def get_sailing_empty(my_env, vessels, i, registry, from_site, duration, max_wave):
     """possible use plugin"""
     if max_wave is not None:
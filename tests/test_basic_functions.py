@@ -3,6 +3,7 @@
 import datetime
 import logging
 import time
+import timeit
 
 import numpy as np
 import pytest
@@ -165,3 +166,174 @@ def test_basic_processor(env, geometry_a):
     np.testing.assert_almost_equal(time_spent, 150)
     assert source.container.get_level() == 700
     assert dest.container.get_level() == 300
+
+
+def test_distance_cache(geometry_a, geometry_b):
+    """Distances of repeated pairs of geometries are served from the cache."""
+    cache = core.DistanceCache(maxsize=2)
+    distance = cache.distance(geometry_a, geometry_b)
+    _, _, expected = core.WGS84.inv(0, 0, 1, 1)
+    assert distance == expected
+    assert cache.distance(geometry_a, geometry_b) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.distance(geometry_a, shapely.geometry.Point(2, 2))
+    cache.distance(geometry_a, shapely.geometry.Point(3, 3))
+    assert len(cache) == 2
+    # (a, b) was the oldest distance
+    cache.distance(geometry_a, geometry_b)
+    assert cache.misses == 4
+
+    core.distance_cache.clear()
+    movable = core.Movable(env=simpy.Environment(), geometry=geometry_a)
+    site = core.Locatable(geometry_a)
+    for _ in range(3):
+        movable.compute_distance(geometry_a, geometry_b)
+        assert movable.is_at(site)
+    assert core.distance_cache.misses == 2
+    assert core.distance_cache.hits == 4
+
+    # a cache hit is cheaper than the geodesic inverse
+    cached = min(
+        timeit.repeat(
+            lambda: core.distance_cache.distance(geometry_a, geometry_b),
+            number=10_000,
+            repeat=5,
+        )
+    )
+    direct = min(
+        timeit.repeat(
+            lambda: core.WGS84.inv(
+                geometry_a.x, geometry_a.y, geometry_b.x, geometry_b.y
+            ),
+            number=10_000,
+            repeat=5,
+        )
+    )
+    assert cached < direct
+
+
+def test_distance_matrix(env, geometry_a, geometry_b, locatable_a, locatable_b):
+    """Durations between sites are looked up in the distance matrix."""
+    locatable_c = core.Locatable(shapely.geometry.Point(2, 1))
+    matrix = core.DistanceMatrix([locatable_a, locatable_b, locatable_c])
+    assert matrix.distances.shape == (3, 3)
+    _, _, expected = core.WGS84.inv(1, 1, 2, 1)
+    assert matrix.distance(locatable_b.geometry, locatable_c.geometry) == expected
+    assert matrix.distance(geometry_a, shapely.geometry.Point(5, 5)) is None
+    assert matrix.durations(2)[1, 2] == expected / 2
+
+    movable = core.Movable(env=env, geometry=geometry_a, v=10)
+    duration = movable.compute_duration(geometry_a, geometry_b)
+    env.distance_matrix = matrix
+    matrix.distances[0, 1] = 10
+    assert movable.compute_duration(geometry_a, geometry_b) == 1
+    assert movable.compute_duration(geometry_b, geometry_a) == duration
+
+
+def test_is_at_many(geometry_a, locatable_a, locatable_b):
+    """One locatable is checked against many locations at once."""
+    assert locatable_a.wgs84 is core.WGS84
+    assert locatable_b.wgs84 is locatable_a.wgs84
+
+    near = shapely.geometry.Point(0.0001, 0)
+    locations = [locatable_b, locatable_a, near]
+    distances = locatable_a.distance_to_many(locations)
+    assert distances.tolist() == [
+        core.WGS84.inv(0, 0, location.x, location.y)[2]
+        for location in [locatable_b.geometry, geometry_a, near]
+    ]
+    np.testing.assert_array_equal(
+        locatable_a.is_at_many(locations), [False, True, True]
+    )
+    np.testing.assert_array_equal(
+        locatable_a.is_at_many(locations, tolerance=1), [False, True, False]
+    )
+
+
+def test_spatial_index(env, geometry_a):
+    """Nearest and radius queries over the registered locatables."""
+
+    class Site(core.Identifiable, core.Log, core.Locatable):
+        pass
+
+    class Movable(core.Movable, core.Identifiable, core.Log):
+        pass
+
+    env.spatial_index = core.SpatialIndex(rebuild_fraction=0.5)
+    sites = [
+        Site(env=env, name=f"site {i}", geometry=shapely.geometry.Point(0.01 * i, 0))
+        for i in range(20)
+    ]
+    vessel = Movable(env=env, name="vessel", geometry=geometry_a, v=10)
+    assert len(env.spatial_index) == 21
+
+    # the vessel itself is left out of the query
+    assert env.spatial_index.nearest(vessel, k=2) == sites[:2]
+    objects, distances = env.spatial_index.within(vessel, 2_500, True)
+    assert objects == sites[:3]
+    np.testing.assert_allclose(
+        distances, [core.WGS84.inv(0, 0, 0.01 * i, 0)[2] for i in range(3)]
+    )
+
+    # a point query returns the vessel as well
+    assert set(env.spatial_index.nearest(geometry_a, k=2)) == {sites[0], vessel}
+    point = shapely.geometry.Point(0.105, 0.001)
+    assert set(env.spatial_index.nearest(point, k=2)) == {sites[10], sites[11]}
+
+    # moving updates the index without a rebuild
+    env.process(vessel.move(sites[15]))
+    env.run()
+    assert env.spatial_index.nearest(sites[15]) == [vessel]
+    assert vessel in env.spatial_index.within(sites[14], 1_200)
+    assert vessel not in env.spatial_index.within(sites[0], 1_200)
+
+    env.spatial_index.remove(vessel)
+    assert set(env.spatial_index.nearest(sites[15], k=2)) == {sites[14], sites[16]}
+    assert vessel not in env.spatial_index.within(sites[15], 100)
+    assert len(env.spatial_index.nearest(point, k=100)) == 20
+
+
+def test_routable_edge_cache(env):
+    """Routable reads the edge lengths and orientations cached on the graph."""
+    import networkx as nx
+
+    from openclsim.core.movable import Routable
+
+    class Vessel(core.Identifiable, Routable):
+        pass
+
+    points = [shapely.geometry.Point(0.1 * i, 0) for i in range(3)]
+    env.graph = nx.Graph()
+    for i, point in enumerate(points):
+        env.graph.add_node(i, geometry=point)
+    # the second edge is drawn from its end to its start
+    env.graph.add_edge(0, 1, geometry=shapely.geometry.LineString(points[:2]))
+    env.graph.add_edge(1, 2, geometry=shapely.geometry.LineString(points[2:0:-1]))
+    core.cache_edge_geometries(env.graph)
+
+    edge = env.graph.edges[1, 2]
+    assert edge["geodesic_length"] == core.WGS84.geometry_length(edge["geometry"])
+    assert edge["geometry_from"][1].equals_exact(
+        Routable.order_geometry(edge["geometry"], points[1]), 0
+    )
+    assert edge["geometry_from"][2] is edge["geometry"]
+
+    vessel = Vessel(env=env, name="vessel", geometry=points[0], route=[0, 1, 2], v=10)
+    length = sum(edge["geodesic_length"] for _, _, edge in env.graph.edges(data=True))
+    assert vessel.compute_distance(points[0], points[2]) == length
+
+    passed = []
+    vessel.on_pass_edge_functions.append(
+        lambda geometry, **kwargs: passed.append(geometry) or env.timeout(0)
+    )
+    vessel.activity_id = "sail"
+    start = env.now
+    env.process(vessel.move())
+    env.run()
+    assert vessel.node == 2
+    assert env.now - start == pytest.approx(length / 10)
+    assert passed == [
+        env.graph.edges[0, 1]["geometry_from"][0],
+        env.graph.edges[1, 2]["geometry_from"][1],
+    ]
@@ -1,8 +1,14 @@
 """Test module for the openclsim container."""
 
+import gc
+
+import matplotlib
+import matplotlib.pyplot
+import numpy as np
 import simpy
 
 from openclsim import core
+from openclsim.plot import get_step_chart
 
 
 def test_put_available():
@@ -106,3 +112,258 @@ def test_empty_full_events():
 
     env.process(process())
     env.run()
+
+
+def test_keyed_levels():
+    """Levels change at once and the returned events have already succeeded."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env, store_capacity=2)
+    container.initialize_container(
+        [
+            {"id": "MP", "capacity": 10, "level": 5},
+            {"id": "TP", "capacity": 4, "level": 0},
+        ]
+    )
+    assert container.container_list == ["MP", "TP"]
+
+    event = container.get(2, id_="MP")
+    assert event.triggered
+    assert container.get_level("MP") == 3
+    container.put(4, id_="TP")
+    assert container.get_container_event(level=4, operator="ge", id_="TP").triggered
+
+    assert container.get_capacity("TP") == 4
+    assert container.get_level("unknown") == 0
+    assert container.items == [
+        {"id": "MP", "capacity": 10, "level": 3},
+        {"id": "MP_reservations", "capacity": 10, "level": 5},
+        {"id": "TP", "capacity": 4, "level": 4},
+        {"id": "TP_reservations", "capacity": 4, "level": 0},
+    ]
+
+
+def test_threshold_events():
+    """A level change only fires the events of which the threshold was crossed."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 5}])
+
+    at_least = {
+        (level, operator): container.get_container_event(level, operator)
+        for level in range(11)
+        for operator in ["ge", "gt"]
+    }
+    at_most = {
+        (level, operator): container.get_container_event(level, operator)
+        for level in range(11)
+        for operator in ["le", "lt"]
+    }
+    events = {**at_least, **at_most}
+
+    def check(current):
+        for (level, operator), event in events.items():
+            expected = {
+                "ge": current >= level,
+                "gt": current > level,
+                "le": current <= level,
+                "lt": current < level,
+            }[operator]
+            # events stay triggered once their threshold was crossed
+            if expected:
+                assert event.triggered, (current, level, operator)
+
+    check(5)
+    rising, falling = container._thresholds["default"]
+    assert len(rising) == 11 and len(falling) == 11
+
+    container.put(2)
+    check(7)
+    assert not at_least[(7, "gt")].triggered
+    assert len(rising) == 7
+
+    container.get(7)
+    check(0)
+    assert [key for *_, key in falling] == [("default", 0, "lt")]
+    assert not at_least[(8, "ge")].triggered
+
+
+def test_stale_events_are_evicted():
+    """The registries of container events stay bounded."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env, max_triggered_events=5)
+    container.initialize_container([{"id": "default", "capacity": 100, "level": 50}])
+
+    # triggered events are kept for reuse up to the bound
+    events = [container.get_container_event(level, "le") for level in range(50, 60)]
+    assert all(event.triggered for event in events)
+    assert container.get_container_event(59, "le") is events[-1]
+    assert len(container._triggered_events) == 5
+    assert container.evicted_events == 5
+
+    # pending events are dropped when nobody waits for or refers to them
+    kept = container.get_container_event(60, "ge")
+    for level in range(61, 200):
+        container.get_container_event(level, "ge")
+    assert ("default", 60, "ge") in container._container_events
+    assert len(container._container_events) <= 64
+    container._prune_pending()
+    assert list(container._container_events) == [("default", 60, "ge")]
+    assert container._thresholds["default"][0][0][-1] == ("default", 60, "ge")
+    assert container.evicted_events == 5 + 139
+    container.put(10)
+    assert kept.triggered
+
+    # pending events that are waited for are kept until they fire
+    waiting = container.get_container_event(70, "ge")
+    assert container.get_container_event(70, "ge") is waiting
+    container.put(10)
+    assert waiting.triggered
+    assert len(container._container_events) == 0
+
+
+def test_waiting_process_is_not_collected():
+    """A process that waits for a level event resumes after a collection."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 0}])
+    resumed = []
+
+    def waiter():
+        yield container.get_container_event(5, "ge")
+        resumed.append(env.now)
+
+    def supplier():
+        log = []
+        for i in range(2000):
+            log.append([i])
+            yield env.timeout(1)
+        gc.collect()
+        yield container.put(6)
+
+    env.process(waiter())
+    env.process(supplier())
+    env.run()
+    assert resumed == [2000]
+    assert container.evicted_events == 0
+
+
+def test_reservations():
+    """Reservations change at once and only schedule events for waiters."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 5}])
+
+    container.put_reservation(3)
+    container.get_reservation(1)
+    assert container.get_level("default_reservations") == 7
+    assert container.get_level() == 5
+    assert len(env._queue) == 0
+
+    full = container.get_full_event(id_="default_reservations")
+    container.put_reservation(3)
+    assert full.triggered
+    assert len(env._queue) == 1
+
+
+def test_claims():
+    """Claims are granted in order, as far as the level can serve them."""
+    env = simpy.Environment()
+    container = core.EventsContainer(env=env)
+    container.initialize_container([{"id": "default", "capacity": 10, "level": 4}])
+
+    first = container.claim_content(3)
+    second = container.claim_content(3)
+    third = container.claim_content(1)
+    urgent = container.claim_content(2, priority=-1)
+    assert first.triggered
+    # claims behind a waiting claim are not served first
+    assert not any(claim.triggered for claim in [second, third, urgent])
+
+    container.put(1)
+    assert urgent.triggered and not second.triggered
+
+    container.release_claim(third)
+    container.get(3)
+    container.release_claim(first)
+    container.put(3)
+    assert second.triggered
+    assert container._claim_queues[("default", "content")] == []
+
+    space = container.claim_space(5)
+    assert space.triggered
+    assert not container.claim_space(2).triggered
+
+    # a requeued claim keeps its place in front of the later claims
+    for claim in [space, urgent, second]:
+        container.release_claim(claim)
+    first = container.claim_content(4)
+    later = container.claim_content(2)
+    assert first.triggered and not later.triggered
+    container.get(2)
+    first = container.requeue_claim(first)
+    assert not first.triggered and not later.triggered
+    container.put(1)
+    assert first.triggered and not later.triggered
+
+    # a partial claim is granted what is left, a reduced claim frees the rest
+    container.release_claim(later)
+    rest = container.claim_content(3, partial=True)
+    assert not rest.triggered
+    container.reduce_claim(first, 2)
+    assert rest.triggered and rest.value == rest.amount == 2
+    assert container._claimed[("default", "content")] == 4
+
+
+def test_direct_level_container():
+    """Puts and gets on a DirectLevelContainer do not schedule events."""
+    env = simpy.Environment()
+    Site = type("Site", (core.HasContainer,), {})
+    site = Site(
+        env=env, capacity=10, level=5, container_class=core.DirectLevelContainer
+    )
+    container = site.container
+    assert isinstance(container, core.DirectLevelContainer)
+
+    def process():
+        yield container.get(2)
+        yield container.put(1)
+        assert env.now == 0
+        assert len(env._queue) == 0
+        # level events are still available when requested
+        at_least_6 = container.get_container_event(level=6, operator="ge")
+        yield container.put(2)
+        assert at_least_6.triggered
+        yield at_least_6
+        assert container.get_level() == 6
+
+    env.process(process())
+    env.run()
+    assert container.get_level() == 6
+
+
+def test_level_series():
+    """Containers record their level changes, also without a log."""
+    matplotlib.use("Agg")
+    env = simpy.Environment()
+    env.log_level = core.LogLevel.NONE
+    Site = type("Site", (core.Identifiable, core.Log, core.HasContainer), {})
+    site = Site(env=env, name="Site", capacity=10, level=5)
+
+    def process():
+        yield env.timeout(10)
+        yield site.container.get(2)
+        yield site.container.put(1)
+        yield env.timeout(5)
+        yield site.container.put(4)
+
+    env.process(process())
+    env.run()
+
+    times, levels = site.container.get_level_series()
+    np.testing.assert_array_equal(times, [0, 10, 15])
+    np.testing.assert_array_equal(levels, [5, 4, 8])
+    assert len(site.logbook) == 0
+
+    fig = get_step_chart([site])
+    assert len(fig.axes[0].lines) == 1
+    matplotlib.pyplot.close(fig)
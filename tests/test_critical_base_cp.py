@@ -59,6 +59,19 @@ def test_get_recorded_activity_df_4_barges(simulation_4_barges):
     }
 
 
+def test_combine_logs_event_table(simulation_4_barges, simulation_4_barges_event_table):
+    """Test that combining the logs from a shared event table gives the same result."""
+    log_all = TestCP(**simulation_4_barges).combine_logs()
+    log_table = TestCP(**simulation_4_barges_event_table).combine_logs()
+
+    assert list(log_table.columns) == list(log_all.columns)
+    columns = ["Timestamp", "SimulationObject", "Activity", "ActivityState"]
+    pd.testing.assert_frame_equal(
+        log_table.sort_values(columns)[columns].reset_index(drop=True),
+        log_all.sort_values(columns)[columns].reset_index(drop=True),
+    )
+
+
 def test_get_recorded_activity_df_2_barges_storm(simulation_2_barges_storm):
     """
     Test creation of recorded_activities_df in simulation
@@ -0,0 +1,508 @@
+"""Test module for the openclsim log and logbook backends."""
+
+import datetime
+
+import pandas as pd
+import pytest
+import shapely.geometry
+import simpy
+
+import openclsim.core as core
+import openclsim.model as model
+from openclsim.plot import get_log_dataframe
+
+from .test_utils import assert_log
+
+
+def run_simulation(env):
+    """Run a small sequential simulation and return the vessel and activity."""
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.ContainerDependentMovable,
+            core.Processor,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    location_to_site = shapely.geometry.Point(4.25222222, 52.11428333)
+
+    from_site = Site(
+        env=env,
+        name="Winlocatie",
+        id="Winlocatie",
+        geometry=location_from_site,
+        capacity=10,
+        level=10,
+    )
+    to_site = Site(
+        env=env,
+        name="Dumplocatie",
+        id="Dumplocatie",
+        geometry=location_to_site,
+        capacity=10,
+        level=0,
+    )
+    vessel = TransportProcessingResource(
+        env=env,
+        name="Hopper",
+        id="Hopper",
+        geometry=location_from_site,
+        capacity=5,
+        compute_v=lambda x: 10,
+    )
+
+    sub_processes = [
+        model.ShiftAmountActivity(
+            env=env,
+            name="Loading",
+            id="Loading",
+            registry=registry,
+            processor=vessel,
+            origin=from_site,
+            destination=vessel,
+            amount=5,
+            duration=100,
+        ),
+        model.MoveActivity(
+            env=env,
+            name="Sailing filled",
+            id="Sailing filled",
+            registry=registry,
+            mover=vessel,
+            destination=to_site,
+        ),
+        model.ShiftAmountActivity(
+            env=env,
+            name="Unloading",
+            id="Unloading",
+            registry=registry,
+            processor=vessel,
+            origin=vessel,
+            destination=to_site,
+            amount=5,
+            duration=100,
+        ),
+        model.MoveActivity(
+            env=env,
+            name="Sailing empty",
+            id="Sailing empty",
+            registry=registry,
+            mover=vessel,
+            destination=from_site,
+        ),
+    ]
+    activity = model.WhileActivity(
+        env=env,
+        name="While",
+        id="While",
+        registry=registry,
+        sub_processes=[
+            model.SequentialActivity(
+                env=env,
+                name="Sequence",
+                id="Sequence",
+                registry=registry,
+                sub_processes=sub_processes,
+            )
+        ],
+        condition_event={"type": "container", "concept": to_site, "state": "full"},
+    )
+    model.register_processes([activity])
+    env.run()
+    return vessel, activity
+
+
+def test_columnar_logbook_matches_list_logbook():
+    """The columnar logbook gives the same log as the record oriented list."""
+    vessel, activity = run_simulation(simpy.Environment())
+
+    env = simpy.Environment()
+    env.logbook_class = core.ColumnarLogbook
+    columnar_vessel, columnar_activity = run_simulation(env)
+
+    assert isinstance(columnar_vessel.logbook, core.ColumnarLogbook)
+    assert len(columnar_vessel.logbook) == len(vessel.logbook)
+    assert list(columnar_vessel.logbook) == vessel.logbook
+    assert columnar_vessel.logbook[-1] == vessel.logbook[-1]
+    assert columnar_vessel.log == vessel.log
+    assert columnar_activity.log == activity.log
+
+    assert_log(columnar_vessel)
+    assert_log(columnar_activity)
+
+
+def test_columnar_logbook_append():
+    """Record oriented entries can be appended to a columnar logbook."""
+    env = simpy.Environment()
+    obj = core.Log(env=env, logbook_class=core.ColumnarLogbook)
+    obj.log_entry_v1(0, "a", core.LogState.START)
+    obj.logbook.append(obj.logbook[0])
+
+    assert len(obj.logbook) == 2
+    assert obj.logbook[0] == obj.logbook[1]
+    assert obj.log["ActivityID"] == ["a", "a"]
+    assert obj.log["ActivityState"] == ["START", "START"]
+
+
+def test_columnar_logbook_shares_equal_states():
+    """Equal object states of consecutive entries are stored once."""
+    env = simpy.Environment()
+    obj = core.Log(env, logbook_class=core.ColumnarLogbook)
+    for t, level in enumerate([1, 1, 2, 2, 1]):
+        obj.logbook.append_v1(t, "a", core.LogState.START, {"level": level})
+
+    assert len(obj.logbook._snapshots) == 3
+    assert obj.log["ObjectState"] == [{"level": level} for level in [1, 1, 2, 2, 1]]
+
+
+def test_log_cache():
+    """The log format is cached and only extended with new entries."""
+    env = simpy.Environment()
+    obj = core.Log(env=env)
+    assert obj.log["Timestamp"] == []
+
+    obj.log_entry_v1(0, "a", core.LogState.START)
+    first = obj.log
+    assert obj.log["ActivityID"] is not first["ActivityID"]
+
+    # changing a returned log does not change the cache
+    first["ActivityID"].append("X")
+    obj.log_entry_v1(10, "a", core.LogState.STOP)
+    second = obj.log
+    assert first["ActivityState"] == ["START"]
+    assert second["ActivityID"] == ["a", "a"]
+    assert {len(values) for values in second.values()} == {2}
+    assert second["ActivityState"] == ["START", "STOP"]
+    assert second["Timestamp"][-1] == datetime.datetime(1970, 1, 1, 0, 0, 10)
+
+    # replacing the logbook invalidates the cache
+    obj.logbook = []
+    assert obj.log["ActivityID"] == []
+
+
+def test_delta_states():
+    """Unchanged object states refer to the previous snapshot."""
+    vessel, _ = run_simulation(simpy.Environment())
+
+    for logbook_class in [list, core.ColumnarLogbook]:
+        env = simpy.Environment()
+        env.logbook_class = logbook_class
+        env.log_delta_states = True
+        delta_vessel, _ = run_simulation(env)
+
+        states = delta_vessel.log["ObjectState"]
+        assert states == vessel.log["ObjectState"]
+        assert len({id(state) for state in states}) < len(states)
+        for previous, state in zip(states[:-1], states[1:]):
+            assert (previous is state) == (previous == state)
+
+
+@pytest.mark.parametrize("sink_class", [core.ParquetLogSink, core.ArrowLogSink])
+def test_log_sink(tmp_path, sink_class):
+    """Entries streamed to a file are read back transparently."""
+    pytest.importorskip("pyarrow")
+    vessel, activity = run_simulation(simpy.Environment())
+
+    env = simpy.Environment()
+    env.log_sink = sink_class(tmp_path / "log.bin", buffer_size=7)
+    sink_vessel, sink_activity = run_simulation(env)
+
+    assert isinstance(sink_vessel.logbook, core.SinkLogbook)
+    assert env.log_sink.parts == [tmp_path / "log.bin"]
+    assert len(sink_vessel.logbook) == len(vessel.logbook)
+    assert sink_vessel.log == vessel.log
+    assert sink_activity.log == activity.log
+    assert list(sink_vessel.logbook) == vessel.logbook
+    assert sink_vessel.logbook[3] == vessel.logbook[3]
+    pd.testing.assert_frame_equal(
+        get_log_dataframe(sink_vessel), get_log_dataframe(vessel)
+    )
+
+    # slices are taken like the slices of a list
+    assert sink_vessel.logbook[::-1] == vessel.logbook[::-1]
+    assert sink_vessel.logbook[-2:3:-3] == vessel.logbook[-2:3:-3]
+    assert sink_vessel.logbook[5:2] == []
+
+    # reading while logging does not finalize the file
+    for i in range(20):
+        sink_vessel.log_entry_v1(env.now + i, f"extra {i}", core.LogState.UNKNOWN)
+        assert sink_vessel.log["ActivityID"][-1] == f"extra {i}"
+        assert len(sink_vessel.logbook) == len(vessel.logbook) + i + 1
+    assert env.log_sink.parts == [tmp_path / "log.bin"]
+    assert sink_activity.log == activity.log
+    # the entries are not kept in memory by the object
+    assert sink_vessel._log_cache is None
+
+    # the file is finalized every part_size entries
+    env.log_sink.close()
+    assert sink_vessel.log["ActivityID"][-1] == "extra 19"
+    assert len(env.log_sink.read(sink_vessel.logbook.owner)) == len(sink_vessel.logbook)
+    assert len(env.log_sink.read()) == sum(
+        len(env.log_sink.read(owner)) for owner in range(env.log_sink.n_owners)
+    )
+
+    env = simpy.Environment()
+    env.log_sink = sink_class(tmp_path / "parts.bin", buffer_size=7, part_size=14)
+    sink_vessel, sink_activity = run_simulation(env)
+    n_entries = sum(
+        len(env.log_sink.read(owner)) for owner in range(env.log_sink.n_owners)
+    )
+    assert len(env.log_sink.parts) == -(-(n_entries // 7) // 2)
+    assert sink_vessel.log == vessel.log
+    assert sink_activity.log == activity.log
+
+
+def test_event_table():
+    """The logbooks of all objects are views on one shared event table."""
+    vessel, activity = run_simulation(simpy.Environment())
+
+    env = simpy.Environment()
+    env.event_table = core.EventTable()
+    table_vessel, table_activity = run_simulation(env)
+
+    assert isinstance(table_vessel.logbook, core.TableLogbook)
+    assert table_vessel.logbook.table is env.event_table
+    assert list(table_vessel.logbook) == vessel.logbook
+    assert table_vessel.logbook[-2:] == vessel.logbook[-2:]
+    assert table_vessel.log == vessel.log
+    assert table_activity.log == activity.log
+
+    df = env.event_table.to_dataframe()
+    assert len(df) == len(env.event_table)
+    counts = df.groupby("ObjectName").size()
+    assert counts["Hopper"] == len(vessel.logbook)
+    assert counts["While"] == len(activity.logbook)
+
+    df_vessel = env.event_table.to_dataframe(objects=[table_vessel])
+    assert list(df_vessel["ObjectID"].unique()) == ["Hopper"]
+    assert df_vessel["Timestamp"].tolist() == vessel.log["Timestamp"]
+
+
+def test_log_level():
+    """Suppressed log entries are not written."""
+    vessel, activity = run_simulation(simpy.Environment())
+    sequence = activity.sub_processes[0]
+
+    env = simpy.Environment()
+    env.log_level = core.LogLevel.ACTIVITY_ONLY
+    activity_vessel, activity_only = run_simulation(env)
+    activity_sequence = activity_only.sub_processes[0]
+    assert len(activity_vessel.logbook) == 0
+    assert len(activity_only.logbook) == 2
+    assert activity_sequence.log["ActivityLabel"] == [
+        {} for _ in activity_sequence.logbook
+    ]
+    assert len(activity_sequence.logbook) == len(
+        [label for label in sequence.log["ActivityLabel"] if not label]
+    )
+
+    env = simpy.Environment()
+    env.log_level = core.LogLevel.OBJECT_ONLY
+    object_vessel, object_only = run_simulation(env)
+    assert object_vessel.log == vessel.log
+    assert len(object_only.logbook) == 0
+
+    env = simpy.Environment()
+    env.log_level = core.LogLevel.NONE
+    none_vessel, none_activity = run_simulation(env)
+    assert len(none_vessel.logbook) == 0
+    assert len(none_activity.logbook) == 0
+    assert env.now > 0
+
+
+def test_activity_log_level():
+    """The log level can be set per activity."""
+    env = simpy.Environment()
+    registry = {}
+    reporting_activity = model.BasicActivity(
+        env=env,
+        name="Reporting activity",
+        registry=registry,
+        duration=0,
+    )
+    basic_activity = model.BasicActivity(
+        env=env,
+        name="Basic activity",
+        registry=registry,
+        duration=14,
+        additional_logs=[reporting_activity],
+        log_level=core.LogLevel.ACTIVITY_ONLY,
+    )
+    model.register_processes([basic_activity])
+    env.run()
+
+    assert basic_activity.log["ActivityState"] == ["START", "STOP"]
+    assert len(reporting_activity.logbook) == 0
+
+
+def test_float_timestamps():
+    """The logbook stores the simulation time, the log converts it to datetimes."""
+    for logbook_class in [list, core.ColumnarLogbook]:
+        env = simpy.Environment(initial_time=1_600_000_000.1234567)
+        obj = core.Log(env=env, logbook_class=logbook_class)
+        obj.log_entry_v1(env.now, "a", core.LogState.START)
+        obj.log_entry_v1(env.now + 0.5, "a", core.LogState.STOP)
+
+        assert obj.logbook[0]["Timestamp"] == env.now
+        assert obj.log["Timestamp"] == [
+            datetime.datetime.fromtimestamp(t, datetime.timezone.utc).replace(
+                tzinfo=None
+            )
+            for t in [env.now, env.now + 0.5]
+        ]
+
+
+def test_id_table():
+    """Ids are interned per environment and decoded when presented."""
+    env = simpy.Environment()
+    env.logbook_class = core.ColumnarLogbook
+    vessel, activity = run_simulation(env)
+
+    id_table = core.get_id_table(env)
+    assert env.id_table is id_table
+    assert id_table.ids[vessel.id_code] == "Hopper"
+    assert id_table.names[activity.id_code] == "While"
+    assert vessel.logbook.id_table is id_table
+    assert len(id_table) == len(set(id_table.ids))
+
+    df = vessel.logbook.to_dataframe()
+    codes = vessel.logbook.to_dataframe(decode_ids=False)["ActivityID"]
+    assert df["ActivityID"].tolist() == vessel.log["ActivityID"]
+    assert id_table.decode(codes).tolist() == vessel.log["ActivityID"]
+    assert set(id_table.decode_names(codes)) == {
+        "Loading",
+        "Sailing filled",
+        "Unloading",
+        "Sailing empty",
+    }
+
+    env = simpy.Environment()
+    env.event_table = core.EventTable()
+    run_simulation(env)
+    assert env.event_table.id_table is env.id_table
+
+
+def test_state_fields():
+    """The state fields of a composed class are resolved once."""
+    env = simpy.Environment()
+    vessel, _ = run_simulation(env)
+
+    fields = core.get_state_fields(type(vessel))
+    assert [key for key, _ in fields] == ["container level", "geometry", "node"]
+    assert core.get_state_fields(type(vessel)) is fields
+    assert vessel.get_state() == {
+        "geometry": vessel.geometry,
+        "container level": vessel.container.get_level(),
+    }
+
+    Site = type(
+        "Site",
+        (core.Identifiable, core.Log, core.Locatable, core.HasMultiContainer),
+        {"state_fields": (("name", lambda self: self.name),)},
+    )
+    site = Site(
+        env=env,
+        name="Site",
+        geometry=vessel.geometry,
+        node="node",
+        initials=[{"id": "MP", "level": 2, "capacity": 10}],
+    )
+    assert site.get_state() == {
+        "geometry": vessel.geometry,
+        "node": "node",
+        "container level": {"MP": 2},
+        "name": "Site",
+    }
+
+    # mixins that override get_state are chained, before or after Log
+    class HasFuel:
+        def __init__(self, fuel, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.fuel = fuel
+
+        def get_state(self):
+            state = {}
+            if hasattr(super(), "get_state"):
+                state = super().get_state()
+            state["fuel"] = self.fuel
+            return state
+
+    class HasCrew(HasFuel):
+        def get_state(self):
+            state = super().get_state()
+            state["crew"] = 3
+            return state
+
+    expected = {
+        "geometry": vessel.geometry,
+        "container level": 0.0,
+        "fuel": 10,
+    }
+    for bases in [
+        (core.Identifiable, core.Log, HasFuel, core.Locatable, core.HasContainer),
+        (HasFuel, core.Identifiable, core.Log, core.Locatable, core.HasContainer),
+    ]:
+        V = type("V", bases, {})
+        v = V(env=env, name="V", geometry=vessel.geometry, capacity=10, fuel=10)
+        assert v.get_state() == expected
+        v.log_entry_v1(env.now, "a", core.LogState.START)
+        assert v.log["ObjectState"] == [expected]
+
+    V = type(
+        "V",
+        (core.Identifiable, core.Log, HasCrew, core.Locatable, core.HasContainer),
+        {},
+    )
+    v = V(env=env, name="V", geometry=vessel.geometry, capacity=10, fuel=10)
+    assert v.get_state() == dict(expected, crew=3)
+
+
+def test_log_file(tmp_path):
+    """Logs saved to a LogFile are read back and queried through the indexes."""
+    env = simpy.Environment()
+    vessel, activity = run_simulation(env)
+    log_file = core.LogFile.save(tmp_path / "run", [vessel, activity])
+    log_file = core.LogFile(tmp_path / "run")
+
+    assert len(log_file) == len(vessel.logbook) + len(activity.logbook)
+    assert list(log_file.logbook("Hopper")) == vessel.logbook
+
+    expected = vessel.log
+    vessel.logbook = log_file.logbook("Hopper")
+    assert vessel.log == expected
+
+    start, stop = vessel.logbook[4]["Timestamp"], vessel.logbook[10]["Timestamp"]
+    query = vessel.query_log(start=start, stop=stop, activity_id="Loading")
+    assert query["Timestamp"]
+    assert all(id_ == "Loading" for id_ in query["ActivityID"])
+
+    # the same query on an in-memory logbook gives the same entries
+    vessel.logbook = list(log_file.logbook("Hopper"))
+    assert vessel.query_log(start=start, stop=stop, activity_id="Loading") == query
+
+    df = log_file.to_dataframe(activity_id="While")
+    assert df["ObjectName"].unique().tolist() == ["While"]
+    assert df["Timestamp"].tolist() == activity.log["Timestamp"]
+    assert len(log_file.rows(start=start, stop=stop)) == len(
+        log_file.to_dataframe(start=start, stop=stop)
+    )
+    df = get_log_dataframe(vessel, start=start, stop=stop)
+    assert len(df) == len(log_file.rows(object_id="Hopper", start=start, stop=stop))
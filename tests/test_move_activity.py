@@ -79,3 +79,131 @@ def test_move_activity():
     assert_log(activity)
     assert_log(hopper)
     assert_log(to_site)
+
+
+@pytest.mark.parametrize("algorithm", ["dijkstra", "astar"])
+def test_move_activity_routing(algorithm):
+    """Test the move activity over the shortest route of the routing service."""
+    import networkx as nx
+
+    from openclsim.core.movable import Routable
+
+    my_env = simpy.Environment(initial_time=0)
+    registry = {}
+
+    points = {
+        "A": shapely.geometry.Point(0, 0),
+        "B": shapely.geometry.Point(0.1, 0),
+        "C": shapely.geometry.Point(0.2, 0),
+        "D": shapely.geometry.Point(0.1, 0.1),
+    }
+    my_env.graph = nx.Graph()
+    for node, point in points.items():
+        my_env.graph.add_node(node, geometry=point)
+    for a, b in [("A", "B"), ("B", "C"), ("A", "D"), ("D", "C")]:
+        my_env.graph.add_edge(
+            a, b, geometry=shapely.geometry.LineString([points[a], points[b]])
+        )
+    my_env.routing = core.RoutingService(my_env.graph, algorithm=algorithm)
+
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Vessel = type("Vessel", (core.Identifiable, Routable, core.HasResource), {})
+
+    to_site = Site(env=my_env, name="Site", geometry=points["C"])
+    vessel = Vessel(env=my_env, name="Vessel", geometry=points["A"], node="A", v=10)
+
+    activity = model.MoveActivity(
+        env=my_env,
+        name="Sail",
+        registry=registry,
+        mover=vessel,
+        destination=to_site,
+        use_routing=True,
+    )
+    model.register_processes([activity])
+    my_env.run()
+
+    route = my_env.routing.route(vessel, to_site)
+    assert route == ["C"]
+    assert my_env.routing.shortest_path("A", "C") == ["A", "B", "C"]
+    assert my_env.routing.hits == 1
+    assert my_env.routing.misses == 2
+    assert vessel.node == "C"
+    assert vessel.geometry.equals(points["C"])
+    length = my_env.routing.route_length(["A", "B", "C"])
+    assert my_env.now == pytest.approx(length / 10)
+
+
+def test_move_activity_routing_checks():
+    """Test that use_routing requires a Routable mover and a routing service."""
+    import networkx as nx
+
+    from openclsim.core.movable import Routable
+
+    my_env = simpy.Environment(initial_time=0)
+    registry = {}
+
+    points = {
+        "A": shapely.geometry.Point(0, 0),
+        "B": shapely.geometry.Point(0.1, 0),
+        "C": shapely.geometry.Point(0.1, 0.1),
+    }
+    my_env.graph = nx.Graph()
+    for node, point in points.items():
+        my_env.graph.add_node(node, geometry=point)
+    for a, b in [("A", "B"), ("B", "C")]:
+        my_env.graph.add_edge(
+            a, b, geometry=shapely.geometry.LineString([points[a], points[b]])
+        )
+
+    Site = type("Site", (core.Identifiable, core.Log, core.Locatable), {})
+    Vessel = type("Vessel", (core.Identifiable, Routable, core.HasResource), {})
+    Mover = type("Mover", (core.Identifiable, core.Movable, core.HasResource), {})
+
+    to_site = Site(env=my_env, name="Site", geometry=points["C"])
+    # the path is not followed when an explicit route is given
+    vessel = Vessel(
+        env=my_env,
+        name="Vessel",
+        geometry=points["A"],
+        node="A",
+        path=shapely.geometry.LineString([points["A"], points["C"]]),
+        v=10,
+    )
+    mover = Mover(env=my_env, name="Mover", geometry=points["A"], v=10)
+
+    with pytest.raises(ValueError, match="routing service"):
+        model.MoveActivity(
+            env=my_env,
+            name="Sail",
+            registry=registry,
+            mover=vessel,
+            destination=to_site,
+            use_routing=True,
+        )
+
+    my_env.routing = core.RoutingService(my_env.graph)
+    with pytest.raises(ValueError, match="Routable"):
+        model.MoveActivity(
+            env=my_env,
+            name="Sail",
+            registry=registry,
+            mover=mover,
+            destination=to_site,
+            use_routing=True,
+        )
+
+    activity = model.MoveActivity(
+        env=my_env,
+        name="Sail",
+        registry=registry,
+        mover=vessel,
+        destination=to_site,
+        use_routing=True,
+    )
+    model.register_processes([activity])
+    my_env.run()
+
+    assert vessel.node == "C"
+    length = my_env.routing.route_length(["A", "B", "C"])
+    assert my_env.now == pytest.approx(length / 10)
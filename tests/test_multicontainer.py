@@ -1,5 +1,6 @@
 """Test package."""
 
+import pytest
 import shapely.geometry
 import simpy
 
@@ -95,3 +96,121 @@ def test_mulitcontainer():
     assert_log(hopper)
     assert_log(activity)
     assert_log(from_site)
+
+
+def test_multicontainer_bulk_transfer():
+    """Several commodities are shifted in one step."""
+    my_env = simpy.Environment()
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasMultiContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.MultiContainerDependentMovable,
+            core.Processor,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    from_site = Site(
+        env=my_env,
+        name="Winlocatie",
+        geometry=location_from_site,
+        store_capacity=4,
+        initials=[
+            {"id": "MP", "level": 2, "capacity": 10},
+            {"id": "TP", "level": 4, "capacity": 10},
+        ],
+    )
+    hopper = TransportProcessingResource(
+        env=my_env,
+        name="Hopper 01",
+        geometry=location_from_site,
+        store_capacity=4,
+        compute_v=lambda x: 10,
+        initials=[
+            {"id": "MP", "level": 0, "capacity": 2},
+            {"id": "TP", "level": 0, "capacity": 4},
+        ],
+    )
+
+    # unknown ids leave all levels unchanged
+    with pytest.raises(KeyError):
+        from_site.container.get_many({"MP": 1, "XX": 1})
+    assert from_site.container.get_level("MP") == 2
+
+    # a transfer that does not fit leaves all levels unchanged
+    with pytest.raises(ValueError):
+        from_site.container.get_many({"MP": 1, "TP": 5})
+    with pytest.raises(ValueError):
+        hopper.container.put_many({"MP": 1, "TP": 5})
+    assert from_site.container.get_levels().tolist() == [2, 4]
+    assert hopper.container.get_levels().tolist() == [0, 0]
+
+    def process():
+        hopper.activity_id = "bulk"
+        yield from hopper.process(
+            origin=from_site,
+            destination=hopper,
+            shiftamount_fcn=lambda origin, destination: (20, [1, 3]),
+            reserved_amount=[1, 3],
+            id_=["MP", "TP"],
+        )
+
+    my_env.process(process())
+    my_env.run()
+
+    assert my_env.now == 20
+    assert hopper.container.get_level("MP") == 1
+    assert hopper.container.get_level("TP") == 3
+    assert from_site.container.get_level("MP") == 1
+    assert from_site.container.get_level("TP") == 1
+    assert hopper.log["ActivityState"] == ["START", "STOP"]
+    assert from_site.log["ActivityState"] == ["START", "STOP"]
+
+
+def test_multicontainer_arrays():
+    """The levels of all containers are used in vectorized expressions."""
+    my_env = simpy.Environment()
+
+    Vessel = type(
+        "Vessel",
+        (core.MultiContainerDependentMovable, core.Identifiable, core.Log),
+        {},
+    )
+    vessel = Vessel(
+        env=my_env,
+        name="Vessel",
+        geometry=shapely.geometry.Point(4.18055556, 52.18664444),
+        store_capacity=4,
+        compute_v=lambda x: 10 - 5 * x,
+        initials=[
+            {"id": "MP", "level": 2, "capacity": 10},
+            {"id": "TP", "level": 4, "capacity": 10},
+        ],
+    )
+
+    assert vessel.container.get_levels().tolist() == [2, 4]
+    assert vessel.container.get_capacities(["TP"]).tolist() == [10]
+    # the speed depends on the total fill degree of all containers
+    assert vessel.v == 10 - 5 * 6 / 20
+    assert vessel.get_state()["container level"] == {"MP": 2, "TP": 4}
+
+    assert vessel.container.can_get_many({"MP": 2, "TP": 4})
+    assert not vessel.container.can_get_many({"MP": 3})
+    assert vessel.container.can_put_many({"MP": 8, "TP": 6})
+    assert not vessel.container.can_put_many({"MP": 8, "TP": 7})
@@ -80,3 +80,241 @@ def test_shift_amount():
     assert_log(from_site)
     assert_log(hopper)
     assert_log(activity)
+
+
+def test_shift_amount_wait_queue():
+    """Activities in the wait queue are served in priority and FIFO order."""
+    my_env = simpy.Environment()
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    TransportProcessingResource = type(
+        "TransportProcessingResource",
+        (
+            core.ContainerDependentMovable,
+            core.Processor,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+        ),
+        {},
+    )
+
+    location_from_site = shapely.geometry.Point(4.18055556, 52.18664444)
+    from_site = Site(
+        env=my_env,
+        name="Winlocatie",
+        geometry=location_from_site,
+        capacity=20,
+        level=5,
+        nr_resources=3,
+    )
+
+    activities = []
+    for i, priority in enumerate([0, 0, -1]):
+        hopper = TransportProcessingResource(
+            env=my_env,
+            name=f"Hopper {i}",
+            geometry=location_from_site,
+            capacity=5,
+            compute_v=lambda x: 10,
+        )
+        activities.append(
+            model.ShiftAmountActivity(
+                env=my_env,
+                name=f"Loading {i}",
+                registry=registry,
+                processor=hopper,
+                origin=from_site,
+                destination=hopper,
+                amount=5,
+                duration=1,
+                wait_queue=True,
+                queue_priority=priority,
+            )
+        )
+
+    def supply():
+        for _ in range(2):
+            yield my_env.timeout(10)
+            yield from_site.container.put(5)
+
+    model.register_processes(activities)
+    my_env.process(supply())
+    my_env.run()
+
+    # the first activity is served at once, the others when content is supplied
+    stop_times = [activity.log["Timestamp"][-1].timestamp() for activity in activities]
+    assert stop_times == [1, 21, 11]
+    assert from_site.container.get_level() == 0
+    assert from_site.container._claimed == {("default", "content"): 0}
+    for activity in activities:
+        assert_log(activity)
+
+
+def test_shift_amount_wait_queue_retry():
+    """An activity that has to retry keeps its place in the wait queue."""
+    my_env = simpy.Environment()
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    Crane = type(
+        "Crane",
+        (
+            core.Processor,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+        ),
+        {},
+    )
+
+    location = shapely.geometry.Point(4.18055556, 52.18664444)
+    from_site = Site(
+        env=my_env,
+        name="Winlocatie",
+        geometry=location,
+        capacity=20,
+        level=5,
+        nr_resources=3,
+    )
+
+    activities = []
+    for i in range(2):
+        barge = Site(env=my_env, name=f"Barge {i}", geometry=location, capacity=5)
+        crane = Crane(env=my_env, name=f"Crane {i}", geometry=location)
+        activities.append(
+            model.ShiftAmountActivity(
+                env=my_env,
+                name=f"Loading {i}",
+                registry=registry,
+                processor=crane,
+                origin=from_site,
+                destination=barge,
+                amount=5,
+                duration=1,
+                wait_queue=True,
+            )
+        )
+    crane = activities[0].processor
+
+    def block_crane():
+        # the first activity is granted its claims, but waits for the crane
+        with crane.resource.request() as request:
+            yield request
+            yield my_env.timeout(5)
+
+    def take():
+        # content is taken without a claim, the first activity has to retry
+        yield my_env.timeout(2)
+        yield from_site.container.get(3)
+
+    def supply():
+        yield my_env.timeout(10)
+        yield from_site.container.put(5)
+
+    my_env.process(block_crane())
+    my_env.process(take())
+    my_env.process(supply())
+    model.register_processes(activities)
+    my_env.run()
+
+    # the retry of the first activity is served before the second activity
+    stop_times = [activity.log["Timestamp"][-1].timestamp() for activity in activities]
+    assert stop_times == [6, 11]
+    assert [activity.destination.container.get_level() for activity in activities] == [
+        2,
+        5,
+    ]
+    assert from_site.container.get_level() == 0
+    assert from_site.container._claimed == {("default", "content"): 0}
+
+
+def test_shift_amount_wait_queue_remainder():
+    """The last activity in the queue shifts what is left by the others."""
+    my_env = simpy.Environment()
+    registry = {}
+
+    Site = type(
+        "Site",
+        (
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+            core.HasContainer,
+            core.HasResource,
+        ),
+        {},
+    )
+    Crane = type(
+        "Crane",
+        (
+            core.Processor,
+            core.HasResource,
+            core.Identifiable,
+            core.Log,
+            core.Locatable,
+        ),
+        {},
+    )
+
+    location = shapely.geometry.Point(4.18055556, 52.18664444)
+    from_site = Site(
+        env=my_env,
+        name="Winlocatie",
+        geometry=location,
+        capacity=100,
+        level=100,
+        nr_resources=2,
+    )
+
+    activities = []
+    for i in range(2):
+        barge = Site(env=my_env, name=f"Barge {i}", geometry=location, capacity=60)
+        crane = Crane(env=my_env, name=f"Crane {i}", geometry=location)
+        activities.append(
+            model.ShiftAmountActivity(
+                env=my_env,
+                name=f"Loading {i}",
+                registry=registry,
+                processor=crane,
+                origin=from_site,
+                destination=barge,
+                amount=60,
+                duration=1,
+                wait_queue=True,
+            )
+        )
+
+    model.register_processes(activities)
+    my_env.run()
+
+    assert [activity.destination.container.get_level() for activity in activities] == [
+        60,
+        40,
+    ]
+    assert from_site.container.get_level() == 0
+    assert from_site.container._claimed == {("default", "content"): 0}
+    for activity in activities:
+        assert_log(activity)